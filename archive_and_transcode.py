@@ -15,13 +15,23 @@ and runs a post-render integrity check using PyAV (or FFmpeg CLI fallback).
 """
 
 import os
+import re
 import sys
+import json
+import asyncio
+import hashlib
+import threading
 import shutil
 import argparse
+import tempfile
 import subprocess
 import time
 import platform
+from dataclasses import dataclass, field
+from functools import lru_cache, partial
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
 from pathlib import Path
+from typing import Optional
 
 # Optional: PyAV integrity check
 try:
@@ -31,6 +41,27 @@ except ImportError:
     HAVE_PYAV = False
     print("⚠️ PyAV not installed; using FFmpeg CLI for integrity checks.")
 
+# Optional: BLAKE3 for the archive manifest hashes (falls back to BLAKE2b)
+try:
+    import blake3
+    HAVE_BLAKE3 = True
+except ImportError:
+    HAVE_BLAKE3 = False
+
+# Optional: xxHash (XXH3) as the next-fastest manifest hash
+try:
+    import xxhash
+    HAVE_XXHASH = True
+except ImportError:
+    HAVE_XXHASH = False
+
+# Optional: PyNvVideoCodec for direct NVDEC -> NVENC transcodes (--direct-nvenc)
+try:
+    import PyNvVideoCodec as pnvc
+    HAVE_PYNVC = True
+except ImportError:
+    HAVE_PYNVC = False
+
 
 from pathlib import Path
 
@@ -42,6 +73,7 @@ if IS_MAC:
     RESOLVE_EXE_PATH  = "/Applications/DaVinci Resolve/DaVinci Resolve.app"
     DRP_PATH          = os.path.expanduser("~/code/davinci_encoder/Batch_H265.drp")
     PRESET_XML_PATH   = os.path.expanduser("~/code/davinci_encoder/Batch_H265_RenderSettings.xml")
+    PRESET_XML_PATH_ALPHA = os.path.expanduser("~/code/davinci_encoder/QT_Alpha_RenderSettings.xml")
     drx_file          = os.path.expanduser("~/code/davinci_encoder/rawfix.drx")
 elif IS_WIN:
     RESOLVE_PY_MODULE = r"C:\ProgramData\Blackmagic Design\DaVinci Resolve\Support\Developer\Scripting\Modules"
@@ -53,17 +85,149 @@ elif IS_WIN:
     drx_file          = r"C:\code\davinci_encoder\rawfix.drx"
 else:
     sys.exit("❌ Unsupported OS")
+
+# Extra subprocess arguments: on Windows, don't flash a console window for every
+# ffmpeg/ffprobe call and skip handle bookkeeping
+_SUBPROC_KW = {}
+if IS_WIN:
+    _SUBPROC_KW = dict(creationflags=0x08000000, close_fds=False)  # CREATE_NO_WINDOW
     
 
 PROJECT_NAME = "Batch_H265"
 PRESET_NAME = Path(PRESET_XML_PATH).stem
+PRESET_NAME_ALPHA = Path(PRESET_XML_PATH_ALPHA).stem
+
+# Hashes of the last imported preset XMLs, so unchanged presets aren't re-imported
+PRESET_HASH_FILE = os.path.expanduser("~/.h265_archiver/preset.hash")
+
+# Set by init_resolve once the alpha preset has been imported
+HAVE_ALPHA_PRESET = False
+
+# Render preset currently loaded in the project (see load_preset)
+_LOADED_PRESET = None
 
-# Directories (by name) to skip entirely
-EXCLUDE_DIRS = ["Exports", "Proxies", "Proxy"]
+# Resolve page currently open (see open_page)
+_OPEN_PAGE = None
+
+# (width, height, fps) last applied to the project; reset when the project is cleaned
+_PROJECT_VIDEO = None
+
+# Directories (by name, any case) to skip entirely
+EXCLUDE_DIRS = frozenset({"Exports", "Proxies", "Proxy"})
+_EXCLUDE_DIRS_LOWER = frozenset(d.lower() for d in EXCLUDE_DIRS)
 
 # File-name patterns to skip entirely (case-insensitive)
 # e.g. "_proxy" will skip foo_proxy.mov or anything with “proxy” in its stem
 EXCLUDE_FILE_PATTERNS = ["_proxy"]
+# ...compiled into one case-insensitive alternation so each name is scanned once
+_EXCLUDE_RE = (re.compile('|'.join(map(re.escape, EXCLUDE_FILE_PATTERNS)), re.IGNORECASE)
+               if EXCLUDE_FILE_PATTERNS else None)
+
+# Decode a full frame in integrity checks instead of demuxing one packet (--deep-check)
+DEEP_CHECK = False
+
+# Transcode plain 8-bit H.264/HEVC clips straight on the GPU, skipping Resolve, when no
+# grade is applied (--direct-nvenc; needs PyNvVideoCodec and ffmpeg for muxing)
+DIRECT_NVENC = False
+# ...run on every GPU at once, this many NVENC sessions per GPU, alongside Resolve.
+# Clips that fail there are rendered by Resolve instead (_DIRECT_FAILED).
+NVENC_SESSIONS_PER_GPU = 2
+_DIRECT_FAILED = set()
+# ...and sources longer than LONG_CLIP_SECS are cut at keyframes into CHUNK_SECS pieces
+# that are encoded on all of those sessions at once, then joined (see direct_nvenc)
+LONG_CLIP_SECS = 600
+CHUNK_SECS = 60
+# Per-GPU semaphores holding the session count at NVENC_SESSIONS_PER_GPU across whole
+# clips and chunks alike, so chunked clips don't exceed the driver's session limit
+_GPU_SLOTS = {}
+_GPU_SLOTS_LOCK = threading.Lock()
+
+# Threads listing directories in gather_files (hides per-directory latency on SMB/NFS)
+SCAN_WORKERS = 16
+
+# Number of concurrent asset copies (I/O bound, so more threads than cores)
+COPY_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+# Buffer size for copies done in Python
+COPY_CHUNK = 1 << 20
+
+# Resume manifest written to the archive root (see ArchiveManifest)
+MANIFEST_NAME = ".archive_manifest.json"
+# ...rewritten after this many new entries, or this many seconds, whichever comes first
+MANIFEST_FLUSH_EVERY = 50
+MANIFEST_FLUSH_SECS = 30
+HASH_CHUNK = 8 * 1024 * 1024
+HASH_ALGO = 'blake3' if HAVE_BLAKE3 else 'xxh3_64' if HAVE_XXHASH else 'blake2b'
+
+# Hash outputs into the manifest, and re-hash them before trusting an entry (--paranoid)
+PARANOID = False
+
+# Hide per-file copy/skip lines; failures and totals are still printed (--quiet)
+QUIET = False
+
+# Max render jobs queued per StartRendering call
+RENDER_BATCH_SIZE = 16
+
+# Render job states that end the wait in render_queued
+RENDER_DONE = frozenset({'Complete', 'Failed', 'Cancelled'})
+
+# Post-render checks running alongside Resolve (they never call the Resolve API)
+VERIFY_WORKERS = 2
+
+# Max ffprobe processes in flight during the up-front probe (see probe_many)
+PROBE_CONCURRENCY = 16
+
+# ffprobe results by file path (see probe_all)
+_PROBE_CACHE = {}
+
+
+@lru_cache(maxsize=None)
+def _exists_cached(p: str) -> bool:
+    """isfile() for the fixed project/preset/grade paths, which don't change during a run."""
+    return os.path.isfile(p)
+
+
+def is_resolve_running():
+    """
+    Windows only: whether Resolve.exe is running, from one Toolhelp process snapshot
+    (no tasklist subprocess). Returns None on other platforms, or if the snapshot
+    fails, so the caller just tries to connect.
+    """
+    if not IS_WIN:
+        return None
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESSENTRY32W(ctypes.Structure):
+        _fields_ = [('dwSize', wintypes.DWORD), ('cntUsage', wintypes.DWORD),
+                    ('th32ProcessID', wintypes.DWORD), ('th32DefaultHeapID', ctypes.c_size_t),
+                    ('th32ModuleID', wintypes.DWORD), ('cntThreads', wintypes.DWORD),
+                    ('th32ParentProcessID', wintypes.DWORD), ('pcPriClassBase', ctypes.c_long),
+                    ('dwFlags', wintypes.DWORD), ('szExeFile', ctypes.c_wchar * 260)]
+
+    TH32CS_SNAPPROCESS = 0x2
+    kernel32 = ctypes.windll.kernel32
+    # Full prototypes, so the snapshot HANDLE isn't truncated to a 32-bit int on 64-bit
+    kernel32.CreateToolhelp32Snapshot.argtypes = (wintypes.DWORD, wintypes.DWORD)
+    kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+    for fn in (kernel32.Process32FirstW, kernel32.Process32NextW):
+        fn.argtypes = (wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W))
+        fn.restype = wintypes.BOOL
+    kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+    kernel32.CloseHandle.restype = wintypes.BOOL
+    snap = kernel32.CreateToolhelp32Snapshot(TH32CS_SNAPPROCESS, 0)
+    if snap in (None, ctypes.c_void_p(-1).value):  # INVALID_HANDLE_VALUE
+        return None
+    try:
+        entry = PROCESSENTRY32W()
+        entry.dwSize = ctypes.sizeof(entry)
+        ok = kernel32.Process32FirstW(snap, ctypes.byref(entry))
+        while ok:
+            if entry.szExeFile.lower() == 'resolve.exe':
+                return True
+            ok = kernel32.Process32NextW(snap, ctypes.byref(entry))
+        return False
+    finally:
+        kernel32.CloseHandle(snap)
 
 
 def init_resolve():
@@ -84,6 +248,11 @@ def init_resolve():
         return None
 
     # 3) Attempt to connect to the Resolve application via the scripting API
+    #    (fail fast if Resolve isn't running at all, instead of retrying for 30 s)
+    if is_resolve_running() is False:
+        print("❌ DaVinci Resolve doesn’t appear to be running.")
+        print("   Please launch DaVinci Resolve Studio and re-run this script.")
+        return None
     print("⏳ Connecting to Resolve scripting API...", end="", flush=True)
     resolve = None
     for _ in range(30):
@@ -105,7 +274,7 @@ def init_resolve():
     project_list = pm.GetProjectListInCurrentFolder() or []
     if PROJECT_NAME not in project_list:
         print(f"📦 Importing project '{PROJECT_NAME}' from: {DRP_PATH}")
-        if not os.path.isfile(DRP_PATH) or not pm.ImportProject(DRP_PATH, PROJECT_NAME):
+        if not _exists_cached(DRP_PATH) or not pm.ImportProject(DRP_PATH, PROJECT_NAME):
             print(f"❌ Failed to import .drp at {DRP_PATH}")
             return None
     else:
@@ -119,35 +288,94 @@ def init_resolve():
     print(f"✅ Loaded project: {project.GetName()}")
 
     # 5) Switch to the Deliver page and load the render preset
-    resolve.OpenPage("deliver")
-    time.sleep(1)
-
-    # Remove any existing preset with the same name
-    for preset in project.GetRenderPresetList() or []:
-        if preset == PRESET_NAME:
-            project.DeleteRenderPreset(PRESET_NAME)
-            print(f"🗑️ Deleted existing preset '{PRESET_NAME}'")
-            break
+    open_page(resolve, "deliver")
 
-    if not os.path.isfile(PRESET_XML_PATH):
+    if not _exists_cached(PRESET_XML_PATH):
         print(f"❌ Render preset XML not found at: {PRESET_XML_PATH}")
         return None
 
-    if not resolve.ImportRenderPreset(PRESET_XML_PATH):
+    existing = set(project.GetRenderPresetList() or [])
+    if not import_preset(resolve, project, PRESET_XML_PATH, PRESET_NAME, existing):
         print("⚠️ Warning: render preset import may have failed.")
-    else:
-        print(f"✅ Imported render preset '{PRESET_NAME}'")
+
+    # Optional QuickTime preset for clips with an alpha channel
+    global HAVE_ALPHA_PRESET
+    if _exists_cached(PRESET_XML_PATH_ALPHA):
+        HAVE_ALPHA_PRESET = import_preset(resolve, project, PRESET_XML_PATH_ALPHA, PRESET_NAME_ALPHA, existing)
+    if not HAVE_ALPHA_PRESET:
+        print("⚠️ Alpha render preset not available; alpha clips will use the default preset.")
+
+    # Load the default preset once; load_preset() only reloads it when switching presets
+    load_preset(project, PRESET_NAME)
 
     # 6) Return the Resolve app, Project Manager, and Project objects
     return resolve, pm, project
 
 
-def select_folder_dialog(prompt: str) -> Path:
+def import_preset(resolve, project, xml_path: str, name: str, existing) -> bool:
+    """
+    Import a render preset XML as `name`, replacing any preset of that name. Skipped
+    when `existing` (the project's preset names) already has it and the XML hasn't
+    changed since the last import; hashes are kept in PRESET_HASH_FILE.
+    """
+    digest = hash_file(Path(xml_path))
+    try:
+        hashes = json.loads(Path(PRESET_HASH_FILE).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        hashes = {}
+    if name in existing and hashes.get(name) == digest:
+        print(f"✅ Render preset '{name}' unchanged; skipping import")
+        return True
+
+    if name in existing:
+        project.DeleteRenderPreset(name)
+        print(f"🗑️ Deleted existing preset '{name}'")
+    if not resolve.ImportRenderPreset(xml_path):
+        return False
+    print(f"✅ Imported render preset '{name}'")
+
+    hashes[name] = digest
     try:
+        os.makedirs(os.path.dirname(PRESET_HASH_FILE), exist_ok=True)
+        Path(PRESET_HASH_FILE).write_text(json.dumps(hashes), encoding='utf-8')
+    except OSError:
+        pass
+    return True
+
+
+_TK_ROOT = None
+
+def _get_tk():
+    """Create the hidden Tk root on first use and reuse it for later dialogs."""
+    global _TK_ROOT
+    if _TK_ROOT is None:
         import tkinter as tk
+        _TK_ROOT = tk.Tk(); _TK_ROOT.withdraw()
+    return _TK_ROOT
+
+
+def load_preset(project, name: str):
+    """LoadRenderPreset, skipped when `name` is already the loaded preset."""
+    global _LOADED_PRESET
+    if _LOADED_PRESET != name:
+        project.LoadRenderPreset(name)
+        _LOADED_PRESET = name
+
+
+def open_page(resolve, page: str):
+    """OpenPage and wait for it, skipped when `page` is already the open page."""
+    global _OPEN_PAGE
+    if _OPEN_PAGE != page:
+        resolve.OpenPage(page)
+        wait_until(lambda: resolve.GetCurrentPage() == page, timeout=5)
+        _OPEN_PAGE = page
+
+
+def select_folder_dialog(prompt: str) -> Path:
+    try:
         from tkinter import filedialog
-        root = tk.Tk(); root.withdraw()
-        path = filedialog.askdirectory(title=prompt)
+        root = _get_tk()
+        path = filedialog.askdirectory(parent=root, title=prompt)
         if not path:
             sys.exit("Cancelled.")
         return Path(path)
@@ -155,90 +383,339 @@ def select_folder_dialog(prompt: str) -> Path:
         return Path(input(f"{prompt}: ").strip())
 
 
+SIZE_UNITS = ('bytes','KB','MB','GB','TB')
+
 def format_size(n_bytes: int) -> str:
-    for unit in ('bytes','KB','MB','GB','TB'):
-        if n_bytes < 1024.0 or unit == 'TB':
-            return f"{n_bytes:,.2f} {unit}"
-        n_bytes /= 1024.0
+    # Each unit is 2**10 of the previous one, so the unit index falls out of bit_length()
+    if n_bytes <= 0:
+        return f"{n_bytes:,.2f} bytes"
+    i = min((int(n_bytes).bit_length() - 1) // 10, len(SIZE_UNITS) - 1)
+    return f"{n_bytes / (1 << (i * 10)):,.2f} {SIZE_UNITS[i]}"
 
 
 def gather_files(src: Path, video_exts, raw_exts):
     """
-    Walk src, returning (non_media, media), but skipping:
+    Walk src, returning (non_media, media, media_stems), but skipping:
       • directories in EXCLUDE_DIRS
       • files whose suffix is in raw_exts (skipped entirely)
+      • files whose name matches EXCLUDE_FILE_PATTERNS
+    non_media holds (path, size, sidecar_key) tuples; the size comes from the scandir
+    entry, so the copy step doesn't need to stat the source again, and sidecar_key is
+    (folder, lowercase stem) as strings. media_stems is the frozenset of the same keys
+    for the media files, so side-car detection is a set lookup.
     """
-    vset      = {e.lower() for e in video_exts}
-    skipset   = {e.lower() for e in raw_exts}
-    non_media, media = [], []
+    # One dict lookup per file: lowercase suffix -> True (media) / None (raw, skipped)
+    ext_kind = {e.lower(): True for e in video_exts}
+    ext_kind.update({e.lower(): None for e in raw_exts})
+    non_media, media, media_stems = [], [], set()
+
+    for entry in _walk(src):
+        # Suffix straight from the name string; Path objects are only built for survivors
+        name = entry.name
+        dot = name.rfind('.')
+        suffix = name[dot:].lower() if dot > 0 else ''
+
+        # 2) skip raw-image files entirely
+        kind = ext_kind.get(suffix, False)
+        if kind is None:
+            continue
+
+        # 3) skip excluded name patterns (e.g. *_proxy.mov)
+        if _EXCLUDE_RE and _EXCLUDE_RE.search(name):
+            continue
 
-    for root, dirs, files in os.walk(src):
-        # 1) prune unwanted directories
-        dirs[:] = [d for d in dirs if d not in EXCLUDE_DIRS]
+        # 4) classify what remains
+        stem = name[:dot] if dot > 0 else name
+        key = (entry.path[:-len(name) - 1], stem.lower())
+        if kind:
+            media.append(Path(entry.path))
+            media_stems.add(key)
+        else:
+            non_media.append((Path(entry.path), entry.stat().st_size, key))
 
-        for f in files:
-            p = Path(root) / f
-            suffix = p.suffix.lower()
+    # The parallel walk returns files in no particular order
+    non_media.sort()
+    media.sort()
+    return non_media, media, frozenset(media_stems)
 
-            # 2) skip raw-image files entirely
-            if suffix in skipset:
-                continue
 
-            # 3) classify what remains
-            if suffix in vset:
-                media.append(p)
-            else:
-                non_media.append(p)
+def _scan_dir(path):
+    """List one directory: (file DirEntry objects, subdirectory paths to descend into)."""
+    files, subdirs = [], []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                # 1) prune unwanted directories (and don't follow dir symlinks, like os.walk);
+                #    pruned here once per folder, so files below them are never listed or tested
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name.lower() not in _EXCLUDE_DIRS_LOWER:
+                        subdirs.append(entry.path)
+                elif entry.is_file():
+                    files.append(entry)
+    except OSError as e:
+        # unreadable folder (locked, "System Volume Information", ...): skip it like os.walk
+        print(f"⚠️ Warning: skipping unreadable folder {path}: {e}")
+        return [], []
+    return files, subdirs
+
+
+def _walk(path):
+    """
+    Yield the file DirEntry objects under path. Directories are listed on SCAN_WORKERS
+    threads (scandir releases the GIL), so many listings are in flight at once.
+    """
+    with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as ex:
+        pending = {ex.submit(_scan_dir, path)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                files, subdirs = fut.result()
+                yield from files
+                pending |= {ex.submit(_scan_dir, d) for d in subdirs}
 
-    return non_media, media
 
+def _clonefile(src: Path, dst: Path) -> bool:
+    """
+    macOS only: clone src to dst with clonefile(2). On APFS this is a copy-on-write
+    clone that moves no data. Returns False if cloning isn't possible (other volume/FS).
+    """
+    import ctypes
+    libc = ctypes.CDLL("libc.dylib", use_errno=True)
+    try:
+        os.unlink(dst)  # clonefile refuses to overwrite
+    except FileNotFoundError:
+        pass
+    return libc.clonefile(os.fsencode(src), os.fsencode(dst), 0) == 0
 
-def is_readable(path: Path) -> bool:
+
+def _try_reflink(src: Path, dst: Path) -> bool:
+    """
+    Copy-on-write clone of src to dst with clonefile(2) on macOS (APFS). Only attempted
+    when both sit on the same filesystem; returns False so the caller can fall back to
+    a real copy.
+    """
+    if not IS_MAC:
+        return False
+    try:
+        if os.stat(src).st_dev != os.stat(dst.parent).st_dev:
+            return False
+    except OSError:
+        return False
+    return _clonefile(src, dst)
+
+
+def _copyfile2(src: Path, dst: Path) -> bool:
+    """
+    Windows only: CopyFile2, which copies inside the kernel and lets SMB shares do a
+    server-side copy. Returns False if the call fails.
+    """
+    import ctypes
+    kernel32 = ctypes.windll.kernel32
+    kernel32.CopyFile2.argtypes = (ctypes.c_wchar_p, ctypes.c_wchar_p, ctypes.c_void_p)
+    return kernel32.CopyFile2(str(src), str(dst), None) == 0  # S_OK
+
+
+def _fastcopy(src: Path, dst: Path):
+    """
+    Copy file data: CopyFile2 on Windows (in-kernel, server-side on SMB shares),
+    shutil.copyfile elsewhere (fcopyfile on macOS).
+    """
+    if IS_WIN and _copyfile2(src, dst):
+        return
+    shutil.copyfile(src, dst)
+
+
+def fast_copy(src: Path, dst: Path):
+    """
+    Drop-in replacement for shutil.copy2 that keeps the data copy inside the kernel.
+    - Same filesystem: try a copy-on-write clone first (_try_reflink).
+    - Otherwise _fastcopy.
+    Metadata (mtime, mode) is copied separately, like copy2 does.
+    """
+    if not _try_reflink(src, dst):
+        _fastcopy(src, dst)
+    shutil.copystat(src, dst)
+
+
+def _copy_one(job, manifest=None) -> tuple:
+    """
+    Copy one (src, dst, src_size, dst_size) asset job unless dst already exists with the
+    same size. dst_size comes from the archive index built in __main__ (None when dst
+    wasn't there), so no per-file stat is needed. With a `manifest`, a dst it has
+    recorded must also be unchanged since that copy, and new copies are recorded (the
+    caller saves the manifest afterwards).
+    Returns (status, error) with status 'copied', 'skipped' or 'failed', so one bad
+    file doesn't take down the whole copy pool.
+    """
+    f, outp, size, dst_size = job
+    if dst_size is not None and manifest is not None and manifest.source_matches(outp, size):
+        return 'skipped', None
+    if dst_size == size and (manifest is None or not manifest.has(outp)):
+        return 'skipped', None
+    try:
+        fast_copy(f, outp)
+        if manifest is not None:
+            manifest.record(f, outp, hash_src=False, save=False)
+    except OSError as e:
+        return 'failed', e
+    return 'copied', None
+
+
+def _mp4_has_moov(path: Path, file_size: int) -> bool:
+    """
+    Walk the top-level atoms of an MP4/MOV by seeking over their headers. True when
+    both 'moov' and 'mdat' are present and no atom runs past the end of the file,
+    i.e. the file was finalized and isn't truncated. Reads a few bytes per atom.
+    """
+    seen = set()
+    try:
+        with open(path, 'rb') as f:
+            pos = 0
+            while pos < file_size:
+                f.seek(pos)
+                header = f.read(8)
+                if len(header) < 8:
+                    return False
+                size = int.from_bytes(header[:4], 'big')
+                kind = header[4:8]
+                if size == 1:  # 64-bit size follows the type
+                    ext = f.read(8)
+                    if len(ext) < 8:
+                        return False
+                    size = int.from_bytes(ext, 'big')
+                elif size == 0:  # atom extends to end of file
+                    size = file_size - pos
+                if size < 8 or pos + size > file_size:
+                    return False
+                seen.add(kind)
+                pos += size
+    except OSError:
+        return False
+    return b'moov' in seen and b'mdat' in seen
+
+
+def is_readable(path: Path, deep=None) -> bool:
     """
     Checks if a video file is readable.
-    - PyAV: Attempts to open and decode one frame.
-    - FFmpeg: Probes the first second (-t 1) instead of the whole file for speed.
+    - MP4/MOV (unless deep): a header-only atom walk (_mp4_has_moov) is enough to
+      trust the file; the checks below only run if it fails.
+    - PyAV: Demuxes the first video packet, which proves the container parses and
+      isn't truncated without running the decoder. With deep=True (or --deep-check)
+      it decodes one full frame instead.
+    - FFmpeg: ffprobe parses the headers only; with deep, FFmpeg decodes the first
+      second (-t 1) instead of the whole file.
     """
-    if not path.exists() or path.stat().st_size == 0:
+    if deep is None:
+        deep = DEEP_CHECK
+
+    try:
+        file_size = path.stat().st_size
+    except OSError:
+        file_size = 0
+    if file_size == 0:
         print(f"⚠️ Integrity failed (not found or zero size): {path}")
         return False
+
+    if not deep and path.suffix.lower() in ('.mp4', '.mov') and _mp4_has_moov(path, file_size):
+        return True
         
     if HAVE_PYAV:
         try:
             with av.open(str(path)) as container:
-                # Decode just one frame to confirm readability
-                for frame in container.decode(video=0):
-                    break
+                if deep:
+                    # Decode just one frame to confirm readability
+                    for frame in container.decode(video=0):
+                        break
+                else:
+                    stream = container.streams.video[0]
+                    # H.264/HEVC in MP4/MOV carry their parameter sets in extradata
+                    if stream.codec_context.name in ('h264', 'hevc') and not stream.codec_context.extradata:
+                        print(f"🔍 PyAV found no codec parameter sets in {path.name}")
+                        return False
+                    packet = next(container.demux(stream))
+                    if packet.size == 0 or (not packet.is_keyframe and packet.pts is None):
+                        print(f"🔍 PyAV found no usable video packet in {path.name}")
+                        return False
             return True
         except Exception as e:
             print(f"🔍 PyAV error on {path.name}: {e}")
             return False
             
     # --- OPTIMIZED FFmpeg FALLBACK ---
-    # The "-t 1" argument tells FFmpeg to only process the first second,
-    # making the check significantly faster.
-    p = subprocess.run(
-        ['ffmpeg', '-v', 'error', '-i', str(path), '-t', '1', '-f', 'null', '-'],
-        stderr=subprocess.PIPE,
-        stdout=subprocess.DEVNULL
-    )
+    # Without deep, ffprobe only parses the container and stream headers. With deep,
+    # FFmpeg decodes the first second ("-t 1") rather than the whole file.
+    if deep:
+        cmd = ['ffmpeg', '-v', 'error', '-i', str(path), '-t', '1', '-f', 'null', '-']
+    else:
+        cmd = ['ffprobe', '-v', 'error', '-select_streams', 'v:0',
+               '-show_entries', 'stream=codec_name', '-of', 'csv=p=0', str(path)]
+    try:
+        p = subprocess.run(cmd, stderr=subprocess.PIPE, stdout=subprocess.PIPE, **_SUBPROC_KW)
+    except FileNotFoundError:
+        print(f"⚠️ {cmd[0]} not found; cannot check {path.name}")
+        return False
     
-    if p.returncode != 0:
+    if p.returncode != 0 or (not deep and not p.stdout.strip()):
         print(f"🔍 FFmpeg integrity check failed for {path.name}")
         return False
         
     return True
 
-def get_audio_info(clip):
-    for _ in range(20):
-        props = clip.GetClipProperty()
-        ch = props.get("Audio Channels") or props.get("Audio Ch")
-        if ch not in [None, "", "0"]:
-            break
-        time.sleep(0.25)
+def is_container_ok(path: Path) -> bool:
+    """
+    Cheap resume-time check that never decodes: the MP4/MOV atom walk, or else
+    ffprobe must parse the container and list at least one stream. Falls back to
+    is_readable() if ffprobe isn't installed.
+    """
+    try:
+        file_size = path.stat().st_size
+    except OSError:
+        return False
+    if file_size == 0:
+        return False
+    if path.suffix.lower() in ('.mp4', '.mov') and _mp4_has_moov(path, file_size):
+        return True
 
-    props = clip.GetClipProperty()
-    raw = props.get("Audio Channels") or props.get("Audio Ch")
+    cmd = ['ffprobe', '-v', 'error', '-print_format', 'json', '-show_format', '-show_streams', str(path)]
+    try:
+        p = subprocess.run(cmd, capture_output=True, timeout=5, **_SUBPROC_KW)
+        return p.returncode == 0 and len(json.loads(p.stdout).get('streams') or []) > 0
+    except FileNotFoundError:
+        return is_readable(path, deep=False)
+    except (subprocess.TimeoutExpired, ValueError):
+        return False
+
+def wait_until(predicate, timeout=10, interval=0.05):
+    """
+    Poll predicate() every `interval` seconds until it returns something truthy,
+    or `timeout` seconds pass. Returns the last value of predicate().
+    Used instead of fixed sleeps while waiting on Resolve to catch up.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        result = predicate()
+        if result or time.monotonic() >= deadline:
+            return result
+        time.sleep(interval)
+
+
+def get_audio_info(clip, props=None):
+    """
+    Return (channels, layout) for a media-pool clip. `props` is a GetClipProperty()
+    dict the caller already holds; Resolve is only asked again (every 0.25 s, up to
+    5 s) while the channel count is still missing.
+    """
+    def channel_prop(p):
+        return p.get("Audio Channels") or p.get("Audio Ch")
+
+    if props is None or channel_prop(props) in [None, "", "0"]:
+        def has_channels():
+            nonlocal props
+            props = clip.GetClipProperty()
+            return channel_prop(props) not in [None, "", "0"]
+        wait_until(has_channels, timeout=5, interval=0.25)
+
+    raw = channel_prop(props)
     try:
         channels = int(raw)
     except:
@@ -246,60 +723,474 @@ def get_audio_info(clip):
     layout = (props.get("Audio Track Type") or "").lower()
     return channels, layout
 
-def get_timecode_from_clip(clip):
-    """Return the clip’s start timecode, or None."""
-    props      = clip.GetClipProperty()
+def get_timecode_from_clip(clip, props=None):
+    """Return the clip’s start timecode, or None. Pass `props` to reuse a GetClipProperty() result."""
+    if props is None:
+        props = clip.GetClipProperty()
     return props.get("Start TC") or props.get("Start Timecode")
 
-def get_timecode_from_mp4(mp4_path):
-    """Use ffprobe to read the embedded timecode tag from an MP4."""
-    cmd = [
-        'ffprobe','-v','error',
-        '-select_streams','v:0',
-        '-show_entries','stream_tags=timecode',
-        '-of','default=noprint_wrappers=1:nokey=1',
-        str(mp4_path)
-    ]
+def probe_all(path: Path) -> dict:
+    """
+    Run ffprobe once for a file and return its first video stream as a dict
+    (codec_name, pix_fmt, width, height, r_frame_rate, duration, nb_frames, and
+    tags.timecode when present).
+    Results are cached by path, so alpha detection and timecode lookups share
+    one process spawn. Returns {} if ffprobe is missing or fails.
+    """
+    key = str(path)
+    if key in _PROBE_CACHE:
+        return _PROBE_CACHE[key]
+
     try:
-        out = subprocess.check_output(cmd, text=True).strip()
-        return out or None
-    except Exception:
-        return None
+        out = subprocess.check_output(_probe_cmd(key), text=True, stderr=subprocess.PIPE, **_SUBPROC_KW)
+        info = (json.loads(out).get('streams') or [{}])[0]
+    except subprocess.CalledProcessError as e:
+        print(f"⚠️ ffprobe failed for {Path(key).name}: {e.stderr}")
+        info = {}
+    except (FileNotFoundError, ValueError):
+        info = {}
+    _PROBE_CACHE[key] = info
+    return info
+
+
+def _probe_cmd(key: str) -> list:
+    return [
+        'ffprobe', '-v', 'error',
+        '-select_streams', 'v:0',
+        '-show_entries', 'stream=codec_name,pix_fmt,width,height,r_frame_rate,duration,nb_frames'
+                         ':stream_tags=timecode',
+        '-of', 'json',
+        key
+    ]
+
+
+async def probe_async(path: Path, sem: asyncio.Semaphore) -> dict:
+    """Async version of probe_all(); fills the same cache."""
+    key = str(path)
+    if key in _PROBE_CACHE:
+        return _PROBE_CACHE[key]
+
+    async with sem:
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *_probe_cmd(key), stdout=subprocess.PIPE, stderr=subprocess.PIPE, **_SUBPROC_KW)
+            out, err = await proc.communicate()
+        except FileNotFoundError:
+            out, err, proc = b'', b'', None
+
+    info = {}
+    if proc and proc.returncode:
+        print(f"⚠️ ffprobe failed for {Path(key).name}: {err.decode(errors='replace')}")
+    elif out:
+        try:
+            info = (json.loads(out).get('streams') or [{}])[0]
+        except ValueError:
+            pass
+    _PROBE_CACHE[key] = info
+    return info
+
+
+def probe_many(paths):
+    """
+    Probe all `paths` with up to PROBE_CONCURRENCY ffprobe processes running at once,
+    so later probe_all() calls are served from the cache. A probe that raises is
+    reported and left to probe_all(); it doesn't cancel the others.
+    """
+    async def run():
+        sem = asyncio.Semaphore(PROBE_CONCURRENCY)
+        return await asyncio.gather(*(probe_async(p, sem) for p in paths), return_exceptions=True)
+
+    if paths:
+        for path, res in zip(paths, asyncio.run(run())):
+            if isinstance(res, Exception):
+                print(f"⚠️ ffprobe pre-pass failed for {Path(path).name}: {res}")
+
+
+def get_timecode_from_mp4(mp4_path):
+    """
+    Read the embedded timecode tag from an MP4. Uses PyAV in-process when available
+    (no ffprobe spawn), otherwise probe_all.
+    """
+    if HAVE_PYAV and str(mp4_path) not in _PROBE_CACHE:
+        try:
+            with av.open(str(mp4_path)) as container:
+                stream = container.streams.video[0]
+                return stream.metadata.get('timecode') or container.metadata.get('timecode') or None
+        except Exception:
+            pass
+    return probe_all(mp4_path).get('tags', {}).get('timecode') or None
         
         
 def has_alpha_channel(file_path: Path) -> bool:
-    """Uses ffprobe to detect if a video file has an alpha channel."""
+    """Detect if a video file has an alpha channel from its ffprobe pix_fmt."""
     print(f"🔬 Checking for alpha channel in: {file_path.name}")
-    cmd = [
-        'ffprobe', '-v', 'error',
-        '-select_streams', 'v:0',
-        '-show_entries', 'stream=pix_fmt',
-        '-of', 'default=noprint_wrappers=1:nokey=1',
-        str(file_path)
-    ]
-    try:
-        pix_fmt = subprocess.check_output(cmd, text=True, stderr=subprocess.PIPE).strip()
-        if 'a' in pix_fmt:
-            print(f"✅ Alpha channel detected (format: {pix_fmt}).")
-            return True
-    except subprocess.CalledProcessError as e:
-        print(f"⚠️ ffprobe failed for {file_path.name}: {e.stderr}")
-    except FileNotFoundError:
-        print("⚠️ ffprobe command not found. Cannot detect alpha channels.")
+    pix_fmt = probe_all(file_path).get('pix_fmt')
+    if not pix_fmt:
+        print("⚠️ No pixel format from ffprobe. Cannot detect alpha channels.")
         return False # Fallback to no alpha if ffprobe is missing
+    if 'a' in pix_fmt:
+        print(f"✅ Alpha channel detected (format: {pix_fmt}).")
+        return True
         
     print("🔸 No alpha channel detected.")
     return False
     
     
 
-def transcode_with_resolve(resolve_bundle, clip_path: Path, src_root: Path, archive_root: Path) -> bool:
+def hash_file(path: Path) -> str:
+    """
+    Hex digest of a file: BLAKE3 (multithreaded) if installed, else XXH3-64, else
+    hashlib's BLAKE2b. See HASH_ALGO.
+    """
+    if HAVE_BLAKE3:
+        h = blake3.blake3(max_threads=blake3.blake3.AUTO)
+    elif HAVE_XXHASH:
+        h = xxhash.xxh3_64()
+    else:
+        h = hashlib.blake2b()
+    with open(path, 'rb') as f:
+        while chunk := f.read(HASH_CHUNK):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ArchiveManifest:
+    """
+    JSON sidecar at the archive root recording every verified render and copied asset:
+    {out_rel: {src_size, src_mtime_ns, out_size, out_mtime_ns}}, plus out_hash and (for
+    renders) src_hash with PARANOID. On resume, an output whose size and mtime still
+    match its entry is trusted without opening it; with PARANOID its hash is checked
+    too. Changes are written in batches (see MANIFEST_FLUSH_EVERY / _SECS) to a temp
+    file that is fsync'ed and renamed over the old one. Safe to update from worker threads.
+    """
+    def __init__(self, archive_root: Path):
+        self.root = archive_root
+        self.path = archive_root / MANIFEST_NAME
+        self.algo = HASH_ALGO
+        self._lock = threading.RLock()
+        self._dirty = 0
+        self._last_save = time.monotonic()
+        self.files = {}
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+            if data.get('hash') == self.algo:
+                self.files = data.get('files', {})
+        except (OSError, ValueError):
+            pass
+
+    def _key(self, out_file: Path) -> str:
+        return out_file.relative_to(self.root).as_posix()
+
+    def matches(self, out_file: Path) -> bool:
+        """True if `out_file` is unchanged since it was recorded."""
+        entry = self.files.get(self._key(out_file))
+        if not entry:
+            return False
+        try:
+            st = out_file.stat()
+        except OSError:
+            return False
+        if entry['out_size'] != st.st_size or entry['out_mtime_ns'] != st.st_mtime_ns:
+            return False
+        return not PARANOID or hash_file(out_file) == entry.get('out_hash')
+
+    def has(self, out_file: Path) -> bool:
+        return self._key(out_file) in self.files
+
+    def source_matches(self, out_file: Path, src_size: int) -> bool:
+        """True if `out_file` is unchanged and was produced from a source of `src_size` bytes."""
+        entry = self.files.get(self._key(out_file))
+        return bool(entry) and entry['src_size'] == src_size and self.matches(out_file)
+
+    def record(self, src_file: Path, out_file: Path, hash_src=True, save=True):
+        """
+        Store a freshly verified render or copied asset by size and mtime. With PARANOID
+        its hash is stored too, as is its source's unless `hash_src` is False or the
+        source is unchanged. With save=False the caller is expected to call save() once
+        a batch of records is done; otherwise the manifest is saved in batches.
+        """
+        key = self._key(out_file)
+        src_st, out_st = src_file.stat(), out_file.stat()
+        entry = {
+            'src_size': src_st.st_size, 'src_mtime_ns': src_st.st_mtime_ns,
+            'out_size': out_st.st_size, 'out_mtime_ns': out_st.st_mtime_ns,
+        }
+        if PARANOID:
+            entry['out_hash'] = hash_file(out_file)
+        if PARANOID and hash_src:
+            old = self.files.get(key, {})
+            if old.get('src_size') == src_st.st_size and old.get('src_mtime_ns') == src_st.st_mtime_ns \
+                    and 'src_hash' in old:
+                entry['src_hash'] = old['src_hash']
+            else:
+                entry['src_hash'] = hash_file(src_file)
+        with self._lock:
+            self.files[key] = entry
+            self._dirty += 1
+            if save and (self._dirty >= MANIFEST_FLUSH_EVERY
+                         or time.monotonic() - self._last_save >= MANIFEST_FLUSH_SECS):
+                self.save()
+
+    def save(self):
+        """Write pending changes now (temp file, fsync, atomic rename)."""
+        with self._lock:
+            if not self._dirty:
+                return
+            tmp = self.path.with_suffix('.tmp')
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({'hash': self.algo, 'files': self.files}, f, indent=1)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+            self._dirty = 0
+            self._last_save = time.monotonic()
+
+
+def precheck_outputs(media, src_root: Path, archive_root: Path, manifest=None, existing=None) -> set:
+    """
+    Run is_container_ok (is_readable with --deep-check) over every render that already
+    exists in the archive, on a thread pool. Outputs that still match their `manifest`
+    entry are trusted without a check, and outputs that pass are recorded in it, so
+    the next run trusts them too. `existing` is the archive's {path: size} index from
+    __main__; with it, the .mp4/.mov output names are looked up there instead of
+    stat'ed. Returns the set of output paths that passed, so the render loop doesn't
+    have to block on the checks.
+    """
+    targets, verified = {}, set()
+    for clip_path in media:
+        rel = clip_path.relative_to(src_root) if src_root in clip_path.parents else Path(clip_path.stem)
+        for ext in ('.mp4', '.mov'):
+            out_file = archive_root / rel.parent / f"{clip_path.stem}{ext}"
+            if existing is not None and str(out_file) not in existing:
+                continue
+            if manifest is not None and manifest.matches(out_file):
+                verified.add(out_file)
+            elif existing is not None or out_file.exists():
+                targets[out_file] = clip_path
+    if verified:
+        print(f"📒 {len(verified)} render(s) unchanged since last run (manifest).")
+    if not targets:
+        return verified
+
+    print(f"🔍 Checking {len(targets)} existing render(s)...")
+    check = partial(is_readable, deep=True) if DEEP_CHECK else is_container_ok
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as ex:
+        for out_file, ok in zip(targets, ex.map(check, targets)):
+            if not ok:
+                continue
+            verified.add(out_file)
+            if manifest is not None:
+                try:
+                    manifest.record(targets[out_file], out_file)
+                except OSError as e:
+                    print(f"⚠️ Could not update archive manifest for {out_file.name}: {e}")
+    if manifest is not None:
+        manifest.save()
+    return verified
+
+
+@dataclass
+class RenderContext:
+    """Per-clip state carried from the render step to post-render verification."""
+    out_file: Path
+    rel: Path
+    raw_tc: Optional[str] = None
+    drop_frame: bool = field(init=False, default=False)
+    normalized_tc: Optional[str] = field(init=False, default=None)
+    job_id: Optional[str] = field(init=False, default=None)
+    src_file: Optional[Path] = None
+    manifest: Optional[ArchiveManifest] = None
+
+    def __post_init__(self):
+        # Drop-frame detection and normalization in one place; ffprobe reports
+        # timecodes with colons only, so that's the form used for comparison
+        if self.raw_tc:
+            self.drop_frame = ';' in self.raw_tc
+            self.normalized_tc = self.raw_tc.replace(';', ':') if self.drop_frame else self.raw_tc
+
+
+def verify_output(ctx: RenderContext) -> bool:
+    """Post-render check: output must be readable, and its timecode should match the source."""
+    if not is_readable(ctx.out_file):
+        print(f"⚠️ Integrity check failed on output file: {ctx.rel}"); return False
+    
+    print(f"✅ Integrity OK: {ctx.rel}")
+    if ctx.raw_tc:
+        mp4_tc = get_timecode_from_mp4(ctx.out_file)
+        if mp4_tc and mp4_tc == ctx.normalized_tc:
+            print(f"🎉 SUCCESS: MP4 timecode '{mp4_tc}' matches source.")
+        elif mp4_tc:
+            print(f"❌ WARNING: MP4 timecode '{mp4_tc}' does NOT match source '{ctx.normalized_tc}'.")
+        else:
+            print("⚠️ Could not read timecode from rendered MP4 for verification.")
+
+    if ctx.manifest is not None and ctx.src_file is not None:
+        try:
+            ctx.manifest.record(ctx.src_file, ctx.out_file)
+        except OSError as e:
+            print(f"⚠️ Could not update archive manifest for {ctx.rel}: {e}")
+    
+    return True
+
+
+def can_direct_transcode(clip_path: Path) -> bool:
+    """
+    True if a clip can skip Resolve: --direct-nvenc is on, PyNvVideoCodec is installed,
+    there is no grade to apply, and the source is 8-bit 4:2:0 H.264/HEVC in MP4/MOV.
+    """
+    if not (DIRECT_NVENC and HAVE_PYNVC) or _exists_cached(drx_file):
+        return False
+    if clip_path.suffix.lower() not in ('.mp4', '.mov'):
+        return False
+    info = probe_all(clip_path)
+    return info.get('codec_name') in ('h264', 'hevc') and info.get('pix_fmt') in ('yuv420p', 'yuvj420p', 'nv12')
+
+
+def count_gpus() -> int:
+    """Number of NVIDIA GPUs reported by nvidia-smi (1 if it can't be run)."""
+    try:
+        out = subprocess.check_output(['nvidia-smi', '--query-gpu=index', '--format=csv,noheader'],
+                                      text=True, timeout=5, **_SUBPROC_KW)
+        return max(1, len(out.split()))
+    except (OSError, subprocess.SubprocessError):
+        return 1
+
+
+def _gpu_slot(gpu_id: int) -> threading.BoundedSemaphore:
+    """The session semaphore for GPU `gpu_id` (see _GPU_SLOTS)."""
+    with _GPU_SLOTS_LOCK:
+        return _GPU_SLOTS.setdefault(gpu_id, threading.BoundedSemaphore(NVENC_SESSIONS_PER_GPU))
+
+
+def _nvenc_encode(src: Path, bitstream: Path, preset: str, gpu_id: int) -> int:
+    """
+    Encode `src` to raw HEVC in `bitstream` on GPU `gpu_id`; returns the frame count.
+    Waits for a free session slot on that GPU first.
+    """
+    with _gpu_slot(gpu_id):
+        demuxer = pnvc.CreateDemuxer(filename=str(src))
+        decoder = pnvc.CreateDecoder(gpuid=gpu_id, codec=demuxer.GetNvCodecId(),
+                                     cudacontext=0, cudastream=0, usedevicememory=True)
+        encoder = pnvc.CreateEncoder(demuxer.Width(), demuxer.Height(), "NV12", False,
+                                     codec="hevc", preset=preset, gpuid=gpu_id)
+        frames = 0
+        with open(bitstream, 'wb') as fh:
+            for packet in demuxer:
+                for frame in decoder.Decode(packet):
+                    fh.write(bytearray(encoder.Encode(frame)))
+                    frames += 1
+            fh.write(bytearray(encoder.EndEncode()))
+    return frames
+
+
+def _nvenc_encode_chunked(clip_path: Path, bitstream: Path, preset: str, work_dir: Path) -> bool:
+    """
+    Encode a long clip as CHUNK_SECS pieces spread over every GPU. The pieces share the
+    per-GPU session slots with the other direct transcodes (_gpu_slot), so the calling
+    worker holds no session while it waits for them.
+    The source video is split by an ffmpeg stream copy, so cuts land on keyframes, and
+    each piece is encoded from its own IDR frame, so the raw HEVC pieces join by plain
+    concatenation. Returns False if the split fails or frames were lost at the cuts
+    (open-GOP sources); the clip is then encoded in one session instead.
+    """
+    pattern = work_dir / f"chunk_%04d{clip_path.suffix}"
+    p = subprocess.run(['ffmpeg', '-v', 'error', '-y', '-i', str(clip_path), '-map', '0:v:0', '-c', 'copy',
+                        '-f', 'segment', '-segment_time', str(CHUNK_SECS), '-reset_timestamps', '1',
+                        str(pattern)], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, **_SUBPROC_KW)
+    chunks = sorted(work_dir.glob(f"chunk_*{clip_path.suffix}"))
+    if p.returncode != 0 or not chunks:
+        print(f"⚠️ Could not split {clip_path.name} into chunks: {p.stderr.decode(errors='replace')}")
+        return False
+
+    num_gpus = count_gpus()
+    print(f"🧩 Encoding {clip_path.name} as {len(chunks)} chunk(s) on {num_gpus} GPU(s)")
+    with ThreadPoolExecutor(max_workers=num_gpus * NVENC_SESSIONS_PER_GPU) as ex:
+        frames = sum(ex.map(lambda i: _nvenc_encode(chunks[i], chunks[i].with_suffix('.hevc'),
+                                                    preset, i % num_gpus),
+                            range(len(chunks))))
+    expected = int(probe_all(clip_path).get('nb_frames') or 0)
+    if expected and frames != expected:
+        print(f"⚠️ Chunked encode of {clip_path.name} has {frames} of {expected} frames")
+        return False
+
+    with open(bitstream, 'wb') as out:
+        for chunk in chunks:
+            with open(chunk.with_suffix('.hevc'), 'rb') as fh:
+                shutil.copyfileobj(fh, out, COPY_CHUNK)
+    return True
+
+
+def direct_nvenc(clip_path: Path, out_file: Path, preset: str = 'P4', gpu_id: int = 0) -> bool:
+    """
+    Transcode a clip to HEVC on GPU `gpu_id` with PyNvVideoCodec (NVDEC -> NVENC, frames
+    stay in device memory), then mux the bitstream with the source audio and timecode
+    via ffmpeg stream copy. Clips longer than LONG_CLIP_SECS are encoded in chunks on
+    all GPUs instead (_nvenc_encode_chunked). Returns False (leaving no output) on any
+    failure.
+    """
+    info = probe_all(clip_path)
+    bitstream = out_file.with_suffix('.hevc')
+    try:
+        chunked = False
+        if float(info.get('duration') or 0) > LONG_CLIP_SECS:
+            with tempfile.TemporaryDirectory(prefix='.chunks_', dir=out_file.parent) as work_dir:
+                chunked = _nvenc_encode_chunked(clip_path, bitstream, preset, Path(work_dir))
+        if not chunked:
+            _nvenc_encode(clip_path, bitstream, preset, gpu_id)
+
+        cmd = ['ffmpeg', '-v', 'error', '-y', '-r', info.get('r_frame_rate') or '25',
+               '-i', str(bitstream), '-i', str(clip_path),
+               '-map', '0:v', '-map', '1:a?', '-c', 'copy', '-tag:v', 'hvc1']
+        if tc := info.get('tags', {}).get('timecode'):
+            cmd += ['-timecode', tc]
+        p = subprocess.run(cmd + [str(out_file)], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                           **_SUBPROC_KW)
+        if p.returncode != 0:
+            print(f"❌ ffmpeg mux failed for {clip_path.name}: {p.stderr.decode(errors='replace')}")
+            out_file.unlink(missing_ok=True)
+            return False
+        return True
+    except Exception as e:
+        print(f"❌ Direct NVENC transcode failed for {clip_path.name}: {e}")
+        out_file.unlink(missing_ok=True)
+        return False
+    finally:
+        bitstream.unlink(missing_ok=True)
+
+
+def clean_resolve_project(resolve_bundle):
+    """Remove all render jobs, timelines and media-pool clips from the project."""
+    resolve, pm, project = resolve_bundle
+    mp = project.GetMediaPool()
+    project.DeleteAllRenderJobs()
+    timelines = [project.GetTimelineByIndex(i) for i in range(1, project.GetTimelineCount() + 1)]
+    if timelines := [tl for tl in timelines if tl]: mp.DeleteTimelines(timelines)
+    if clips := mp.GetRootFolder().GetClipList(): mp.DeleteClips(clips)
+    global _PROJECT_VIDEO
+    _PROJECT_VIDEO = None
+    print("🧹 Resolve cleaned.")
+
+
+def queue_clip(resolve_bundle, clip_path: Path, src_root: Path, archive_root: Path,
+               verified=None, manifest=None, gpu_id=None, media_items=None):
+    """
+    Import one clip, build its timeline and add a render job for it, without starting
+    the render. Returns the clip's RenderContext (with job_id set) once queued, True if
+    a good render already exists, or False on failure.
+    `verified` is the set returned by precheck_outputs(); when given, existing outputs
+    are trusted/rejected from it instead of being checked again here. Verified renders
+    are recorded in `manifest` when given.
+    With `gpu_id`, only the direct NVENC path is tried, on that GPU, and None is
+    returned if the clip has to go through Resolve after all.
+    `media_items` maps clip paths to media-pool clips already imported by
+    import_clips(); other clips are imported here on their own.
+    """
     resolve, pm, project = resolve_bundle
     base = clip_path.stem
     rel = clip_path.relative_to(src_root) if src_root in clip_path.parents else Path(base)
     out_folder = archive_root / rel.parent
     
-    use_alpha_preset = has_alpha_channel(clip_path)
+    use_alpha_preset = HAVE_ALPHA_PRESET and has_alpha_channel(clip_path)
     if use_alpha_preset:
         preset_to_use = PRESET_NAME_ALPHA
         # Alpha renders should be .mov, not .mp4
@@ -310,43 +1201,68 @@ def transcode_with_resolve(resolve_bundle, clip_path: Path, src_root: Path, arch
     
     out_folder.mkdir(parents=True, exist_ok=True)
 
-    # 1) Skip if already rendered correctly
-    if out_file.exists() and is_readable(out_file):
-        print(f"✅ Skipping (exists & OK): {rel}")
+    # 1) Skip if already rendered correctly (one stat serves both checks)
+    try:
+        out_st = out_file.stat()
+    except FileNotFoundError:
+        out_st = None
+    if verified is not None:
+        already_ok = out_file in verified
+    else:
+        already_ok = out_st is not None and (is_readable(out_file) if DEEP_CHECK else is_container_ok(out_file))
+    if already_ok:
+        if not QUIET:
+            print(f"✅ Skipping (exists & OK): {rel}")
         return True
 
     # 2) Delete corrupt existing file
-    if out_file.exists():
+    if out_st is not None:
         print(f"⚠️ Corrupt output, deleting old file: {out_file}")
         try: out_file.unlink()
         except OSError as e: print(f"❌ Could not delete old file: {e}"); return False
 
-    # 3) Clean Resolve project
+    # 2b) Simple clips go straight through NVDEC -> NVENC, without Resolve
+    if gpu_id is not None or (not use_alpha_preset and clip_path not in _DIRECT_FAILED
+                              and can_direct_transcode(clip_path)):
+        print(f"⚡ Direct NVENC transcode: {rel}")
+        if direct_nvenc(clip_path, out_file, gpu_id=gpu_id or 0):
+            return verify_output(RenderContext(out_file, rel, probe_all(clip_path).get('tags', {}).get('timecode'),
+                                               src_file=clip_path, manifest=manifest))
+        print(f"↪️ Falling back to Resolve for {rel}")
+        _DIRECT_FAILED.add(clip_path)
+    if gpu_id is not None:
+        return None
+
+    # 3) Resolve handles (the project is cleaned once per batch, see transcode_batch)
     mp = project.GetMediaPool()
     storage = resolve.GetMediaStorage()
-    project.DeleteAllRenderJobs()
-    for i in range(project.GetTimelineCount(), 0, -1):
-        if tl := project.GetTimelineByIndex(i): mp.DeleteTimelines([tl])
-    if clips := mp.GetRootFolder().GetClipList(): mp.DeleteClips(clips)
-    print("🧹 Resolve cleaned.")
 
-    # 4) Import source clip
-    print(f"📥 Importing: {clip_path}")
-    items = storage.AddItemListToMediaPool([str(clip_path)])
-    time.sleep(2)
-    if not items: print(f"❌ Import failed: {clip_path}"); return False
-    clip = items[0]
+    # 4) Import source clip (unless the batch already imported it)
+    clip = (media_items or {}).get(clip_path)
+    if clip is None:
+        print(f"📥 Importing: {clip_path}")
+        items = storage.AddItemListToMediaPool([str(clip_path)])
+        if not items: print(f"❌ Import failed: {clip_path}"); return False
+        clip = items[0]
+    # Wait for Resolve to finish reading the clip's metadata; the props dict is reused below
+    def loaded_props():
+        p = clip.GetClipProperty()
+        return p if p.get('Resolution') else None
+    props = wait_until(loaded_props, timeout=10) or clip.GetClipProperty()
 
     # 5) Set project video settings from clip
-    props = clip.GetClipProperty()
     w, h = map(int, props['Resolution'].split('x'))
     fps = f"{float(props.get('FPS') or props.get('Frame rate')):.6f}".rstrip('0').rstrip('.')
-    print(f"📐 Configuring project video for: {w}x{h} @ {fps} fps")
-    project.SetSetting("timelineUseCustomSettings", "1")
-    project.SetSetting("timelineResolutionWidth", str(w))
-    project.SetSetting("timelineResolutionHeight", str(h))
-    project.SetSetting("timelineFrameRate", fps)
-    project.SetSetting("timelinePlaybackFrameRate", fps)
+    # Clips in a batch share these, so only the first clip of the batch sets them
+    global _PROJECT_VIDEO
+    if _PROJECT_VIDEO != (w, h, fps):
+        print(f"📐 Configuring project video for: {w}x{h} @ {fps} fps")
+        project.SetSetting("timelineUseCustomSettings", "1")
+        project.SetSetting("timelineResolutionWidth", str(w))
+        project.SetSetting("timelineResolutionHeight", str(h))
+        project.SetSetting("timelineFrameRate", fps)
+        project.SetSetting("timelinePlaybackFrameRate", fps)
+        _PROJECT_VIDEO = (w, h, fps)
 
     # 6) Create and configure a clean timeline
     tl_name = f"TL_{base}"
@@ -360,21 +1276,23 @@ def transcode_with_resolve(resolve_bundle, clip_path: Path, src_root: Path, arch
     
     timeline.AddTrack("video")
     
-    channels, layout = get_audio_info(clip)
+    channels, layout = get_audio_info(clip, props)
     if channels > 0:
         is_stereo = "stereo" in layout or channels == 2
         if is_stereo:
             print("🎧 Adding 1 STEREO audio track.")
             timeline.AddTrack("audio", "stereo")
+            wanted_tracks = 1
         else:
             print(f"🎧 Adding {channels} MONO audio track(s).")
             for _ in range(channels):
                 timeline.AddTrack("audio", "mono")
+            wanted_tracks = channels
 
         # --- NEW: Delete the default audio track (A1) ---
         print("🧹 Deleting default audio track...")
         timeline.DeleteTrack("audio", 1)
-        time.sleep(0.5) # Optional: pause briefly to let Resolve update
+        wait_until(lambda: timeline.GetTrackCount("audio") == wanted_tracks, timeout=2)
 
     else:
         print("🔇 No audio channels detected. Skipping audio track creation.")
@@ -382,18 +1300,18 @@ def transcode_with_resolve(resolve_bundle, clip_path: Path, src_root: Path, arch
     project.SetCurrentTimeline(timeline)
 
     # --- ROBUST TIMECODE HANDLING ---
-    raw_source_tc = get_timecode_from_clip(clip)
-    if raw_source_tc:
-        is_drop_frame = ';' in raw_source_tc
-        if is_drop_frame:
-            print(f"Detected Drop-Frame Timecode: {raw_source_tc}")
+    ctx = RenderContext(out_file, rel, get_timecode_from_clip(clip, props),
+                        src_file=clip_path, manifest=manifest)
+    if ctx.raw_tc:
+        if ctx.drop_frame:
+            print(f"Detected Drop-Frame Timecode: {ctx.raw_tc}")
             timeline.SetSetting("timelineDropFrameTimecode", "1")
         else:
-            print(f"Detected Non-Drop-Frame Timecode: {raw_source_tc}")
+            print(f"Detected Non-Drop-Frame Timecode: {ctx.raw_tc}")
             timeline.SetSetting("timelineDropFrameTimecode", "0")
         
         # Pass the original, unaltered timecode string to Resolve
-        timeline.SetStartTimecode(raw_source_tc)
+        timeline.SetStartTimecode(ctx.raw_tc)
     # --- END OF TIMECODE HANDLING ---
 
     # 7) Append the clip
@@ -402,15 +1320,13 @@ def transcode_with_resolve(resolve_bundle, clip_path: Path, src_root: Path, arch
         print("❌ 'AppendToTimeline' command failed."); return False
     
     # 8) Verify clip is on timeline
-    time.sleep(1) 
-    if not timeline.GetItemListInTrack("video", 1):
+    if not wait_until(lambda: timeline.GetItemListInTrack("video", 1), timeout=5):
         print("❌ VERIFICATION FAILED! Video track is empty after append."); return False
     print("✅ Verification successful. Clip is on the timeline.")
     
     # 9) Apply Grade
-    if os.path.exists(drx_file):
-        resolve.OpenPage("color")
-        time.sleep(1)
+    if _exists_cached(drx_file):
+        open_page(resolve, "color")
         timeline_clip = timeline.GetItemListInTrack('video', 1)[0]
         if timeline_clip:
             node_graph = timeline_clip.GetNodeGraph()
@@ -424,41 +1340,127 @@ def transcode_with_resolve(resolve_bundle, clip_path: Path, src_root: Path, arch
                 print(f"⚠️ Cannot apply grade: method not found on NodeGraph for {timeline_clip.GetName()}.")
 
     # 10) Load render settings
-    project.LoadRenderPreset(PRESET_NAME)
+    load_preset(project, preset_to_use)
     project.SetRenderSettings({'TargetDir': str(out_folder), 'CustomName': base})
 
-    # 11) Render
-    resolve.OpenPage("deliver")
-    time.sleep(1)
+    # 11) Queue the render job (started later, together with the rest of the batch).
+    #     AddRenderJob works from any page, so graded clips stay on Color between clips.
     job_id = project.AddRenderJob()
     if not job_id: print(f"❌ Failed to queue render for {base}."); return False
-        
-    print(f"🚀 Rendering job {job_id}...")
-    project.StartRendering([job_id])
-    while project.IsRenderingInProgress(): time.sleep(1)
-    
-    status = project.GetRenderJobStatus(job_id).get('JobStatus')
-    print(f"🏁 Render job finished with status: {status}")
-    
-    if status != 'Complete': print(f"❌ Render did not complete successfully for {rel}"); return False
-    
-    # --- POST-RENDER VERIFICATION ---
-    if not is_readable(out_file):
-        print(f"⚠️ Integrity check failed on output file: {rel}"); return False
-    
-    print(f"✅ Integrity OK: {rel}")
-    if raw_source_tc:
-        mp4_tc = get_timecode_from_mp4(out_file)
-        # Normalize for comparison, as ffprobe often uses only colons
-        source_tc_normalized = raw_source_tc.replace(';', ':')
-        if mp4_tc and mp4_tc == source_tc_normalized:
-            print(f"🎉 SUCCESS: MP4 timecode '{mp4_tc}' matches source.")
-        elif mp4_tc:
-            print(f"❌ WARNING: MP4 timecode '{mp4_tc}' does NOT match source '{source_tc_normalized}'.")
+    print(f"🗂️ Queued render job {job_id} for {rel}")
+
+    ctx.job_id = job_id
+    return ctx
+
+
+def import_clips(storage, clip_paths) -> dict:
+    """
+    Import files into the media pool with one call and wait until Resolve has read
+    their metadata. Returns {path: media-pool clip} for the files that imported.
+    """
+    items = storage.AddItemListToMediaPool([str(p) for p in clip_paths]) or []
+    by_path = {os.path.normcase(it.GetClipProperty().get('File Path') or ''): it for it in items}
+    clips = {p: by_path[os.path.normcase(str(p))] for p in clip_paths
+             if os.path.normcase(str(p)) in by_path}
+    if not clips and len(items) == len(clip_paths):
+        clips = dict(zip(clip_paths, items))  # no file paths reported yet; items come back in order
+
+    pending = list(clips.values())
+    def metadata_read():
+        while pending and pending[0].GetClipProperty().get('Resolution'):
+            pending.pop(0)
+        return not pending
+    wait_until(metadata_read, timeout=5 + len(pending), interval=0.025)
+    return clips
+
+
+def render_queued(resolve_bundle, contexts, verify_pool=None) -> list:
+    """
+    Start every queued job with a single StartRendering call, so NVENC encodes them
+    back to back, and check each job as soon as it finishes. Returns one result per
+    context, in order: False for a failed render, otherwise the verify_output() result,
+    or a Future for it when `verify_pool` is given.
+    """
+    resolve, pm, project = resolve_bundle
+    if not contexts:
+        return []
+
+    print(f"🚀 Rendering {len(contexts)} job(s)...")
+    project.StartRendering([ctx.job_id for ctx in contexts])
+
+    # Jobs render in queue order, so wait on each in turn, polling with exponential
+    # backoff (20 ms .. 500 ms), and verify it while Resolve renders the next one
+    results = []
+    for ctx in contexts:
+        delay = 0.02
+        while (status := (project.GetRenderJobStatus(ctx.job_id) or {}).get('JobStatus')) not in RENDER_DONE:
+            if not project.IsRenderingInProgress():
+                status = (project.GetRenderJobStatus(ctx.job_id) or {}).get('JobStatus')
+                break
+            time.sleep(delay)
+            delay = min(delay * 2, 0.5)
+        print(f"🏁 Render job for {ctx.rel} finished with status: {status}")
+
+        if status != 'Complete':
+            print(f"❌ Render did not complete successfully for {ctx.rel}")
+            results.append(False)
+        # --- POST-RENDER VERIFICATION ---
+        elif verify_pool is not None:
+            results.append(verify_pool.submit(verify_output, ctx))
         else:
-            print("⚠️ Could not read timecode from rendered MP4 for verification.")
-    
-    return True
+            results.append(verify_output(ctx))
+    return results
+
+
+def transcode_batch(resolve_bundle, clip_paths, src_root: Path, archive_root: Path,
+                    verified=None, verify_pool=None, manifest=None) -> list:
+    """
+    Transcode a batch of clips that share resolution and frame rate: clean the project
+    once, queue a render job per clip, and render them all in one go.
+    Returns [(clip_path, result)] with results as described in render_queued().
+    """
+    clean_resolve_project(resolve_bundle)
+
+    # Import every clip that still needs a render with one media-pool call; Resolve
+    # probes a list of files much faster than the same files one import at a time
+    to_import = clip_paths
+    if verified is not None:
+        def rendered(clip_path):
+            rel = clip_path.relative_to(src_root) if src_root in clip_path.parents else Path(clip_path.stem)
+            return any(archive_root / rel.parent / f"{clip_path.stem}{ext}" in verified
+                       for ext in ('.mp4', '.mov'))
+        to_import = [c for c in clip_paths if not rendered(c)]
+    media_items = {}
+    if to_import:
+        print(f"📥 Importing {len(to_import)} clip(s)...")
+        media_items = import_clips(resolve_bundle[0].GetMediaStorage(), to_import)
+
+    results, queued = [], []
+    for clip_path in clip_paths:
+        res = queue_clip(resolve_bundle, clip_path, src_root, archive_root, verified, manifest,
+                         media_items=media_items)
+        if isinstance(res, RenderContext):
+            queued.append((clip_path, res))
+        else:
+            results.append((clip_path, res))
+
+    # Graded clips were queued from the Color page; return to Deliver once per batch
+    if queued:
+        open_page(resolve_bundle[0], "deliver")
+    rendered = render_queued(resolve_bundle, [ctx for _, ctx in queued], verify_pool)
+    results.extend((clip_path, res) for (clip_path, _), res in zip(queued, rendered))
+    return results
+
+
+def format_key(clip_path: Path):
+    """
+    (width, height, frame rate) of a source from the cached ffprobe data. Clips with the
+    same key can share a render batch, since the project settings fit all of them.
+    Unprobed clips get a key of their own.
+    """
+    info = probe_all(clip_path)
+    key = (info.get('width'), info.get('height'), info.get('r_frame_rate'))
+    return clip_path if None in key else key
 
 
 
@@ -472,55 +1474,142 @@ if __name__ == '__main__':
     parser.add_argument('-r', '--raw-exts', nargs='*',
                         default=['.arw', '.cr2', '.cr3', '.nef', '.dng', '.raf', '.orf', '.rw2', '.sr2'],
                         help="Raw file extensions to ignore during asset copy")
+    parser.add_argument('--deep-check', '--deep-verify', action='store_true',
+                        help="Decode a full frame when checking renders (slower)")
+    parser.add_argument('--paranoid', action='store_true',
+                        help="Hash archived files into the resume manifest and re-check the hashes on resume")
+    parser.add_argument('--quiet', action='store_true',
+                        help="Only print failures and totals for copied/skipped files")
+    parser.add_argument('--direct-nvenc', action='store_true',
+                        help="Transcode ungraded 8-bit H.264/HEVC clips with PyNvVideoCodec instead of Resolve")
     args = parser.parse_args()
+    DEEP_CHECK = args.deep_check
+    DIRECT_NVENC = args.direct_nvenc
+    PARANOID = args.paranoid
+    QUIET = args.quiet
+    if DIRECT_NVENC and not HAVE_PYNVC:
+        print("⚠️ PyNvVideoCodec not installed; --direct-nvenc ignored.")
 
     # 1. Determine source and destination
     src = Path(args.source) if args.source else select_folder_dialog("Select project root")
     dst = Path(args.dest)   if args.dest   else select_folder_dialog("Select destination root")
     src, dst = src.resolve(), dst.resolve()
 
-    # 2. Gather all files
-    non_media_all, media_all = gather_files(src, args.video_exts, args.raw_exts)
-
-    # 3. Build map: folder -> set of media stems in that folder
-    media_stems_by_dir = {}
-    for m in media_all:
-        media_stems_by_dir.setdefault(m.parent, set()).add(m.stem.lower())
+    # 2-3. Gather all files, plus the (folder, media stem) pairs for side-car detection
+    non_media_all, media_all, media_stem_pairs = gather_files(src, args.video_exts, args.raw_exts)
 
     # 4. Prepare archive folder
     archive_root = dst / f"{src.name}-265"
     archive_root.mkdir(parents=True, exist_ok=True)
+    manifest = ArchiveManifest(archive_root)
 
     # 5. Copy non-media assets, skipping any file that shares stem with a media file in same folder
-    for f in non_media_all:
+    #    Sizes of what's already in the archive, from one (parallel) scandir pass over it
+    dst_sizes = {entry.path: entry.stat().st_size for entry in _walk(archive_root)}
+    copy_jobs = []
+    for f, size, sidecar_key in non_media_all:
         rel = f.relative_to(src)
-        stem = f.stem.lower()
 
         # Skip side-cars that have same name as media in the same directory
-        if stem in media_stems_by_dir.get(f.parent, set()):
-            print(f"🔕 Skipping side-car asset: {rel}")
+        if sidecar_key in media_stem_pairs:
+            if not QUIET:
+                print(f"🔕 Skipping side-car asset: {rel}")
             continue
 
-        # Copy if not already present with correct size
         outp = archive_root / rel
-        outp.parent.mkdir(parents=True, exist_ok=True)
-        if outp.exists() and outp.stat().st_size == f.stat().st_size:
-            print(f"⏭️ Skipping existing: {rel}")
-            continue
+        copy_jobs.append((f, outp, size, dst_sizes.get(str(outp))))
+
+    # Create the destination tree up front so the copy workers never race on mkdir
+    for d in {outp.parent for _, outp, _, _ in copy_jobs}:
+        os.makedirs(d, exist_ok=True)
+
+    counts = {'copied': 0, 'skipped': 0, 'failed': 0}
+    with ThreadPoolExecutor(max_workers=COPY_WORKERS) as ex:
+        futures = {ex.submit(_copy_one, job, manifest): job[0] for job in copy_jobs}
+        # Results are printed here on the main thread, so lines never interleave
+        for fut in as_completed(futures):
+            rel = futures[fut].relative_to(src)
+            status, err = fut.result()
+            counts[status] += 1
+            if status == 'copied':
+                if not QUIET:
+                    print(f"📋 Copied asset: {rel}")
+            elif status == 'skipped':
+                if not QUIET:
+                    print(f"⏭️ Skipping existing: {rel}")
+            else:
+                print(f"❌ Failed to copy asset {rel}: {err}")
+    print(f"📋 Assets: {counts['copied']} copied, {counts['skipped']} already present, "
+          f"{counts['failed']} failed")
+
+    manifest.save()
+
+    # 6. Check existing renders up front, in parallel (skipping ones the manifest vouches for)
+    verified = precheck_outputs(media_all, src, archive_root, manifest, dst_sizes)
 
-        shutil.copy2(f, outp)
-        print(f"📋 Copied asset: {rel}")
+    # 7. Probe every source with ffprobe in the background while Resolve starts up
+    probe_pool = ThreadPoolExecutor(max_workers=1)
+    probe_fut = probe_pool.submit(probe_many, media_all)
 
-    # 6. Initialize Resolve
+    # 8. Initialize Resolve
     resolve_bundle = init_resolve()
+    probe_pool.shutdown(wait=True)
+    if exc := probe_fut.exception():
+        print(f"⚠️ ffprobe pre-pass failed ({exc}); sources will be probed one at a time.")
     if not resolve_bundle:
         sys.exit(1)
 
-    # 7. Transcode each media file
+    # 9. Transcode each media file, in batches of clips with the same resolution and
+    #    frame rate so Resolve renders each batch from one StartRendering call.
+    #    Finished renders are verified on a background thread while Resolve moves on
+    #    to the next batch (GPU render / CPU check overlap).
+    #    With --direct-nvenc, clips that don't need Resolve are transcoded on every GPU
+    #    at the same time; any that fail there are rendered by Resolve at the end.
+    direct_clips = [c for c in media_all if can_direct_transcode(c)]
+    direct_set = set(direct_clips)
+    batches = {}
     for clip_path in media_all:
-        # Skip proxies and raw files if desired (media_all already excludes proxies by design)
-        if not transcode_with_resolve(resolve_bundle, clip_path, src, archive_root):
+        if clip_path not in direct_set:
+            batches.setdefault(format_key(clip_path), []).append(clip_path)
+
+    num_gpus = count_gpus() if direct_clips else 1
+    direct_pool = ThreadPoolExecutor(max_workers=num_gpus * NVENC_SESSIONS_PER_GPU)
+    direct_futs = [(clip_path, direct_pool.submit(queue_clip, resolve_bundle, clip_path, src, archive_root,
+                                                  verified, manifest, i % num_gpus))
+                   for i, clip_path in enumerate(direct_clips)]
+    if direct_clips:
+        print(f"⚡ {len(direct_clips)} clip(s) go to direct NVENC on {num_gpus} GPU(s)")
+
+    pending = []
+    with ThreadPoolExecutor(max_workers=VERIFY_WORKERS) as verify_pool:
+        def run_batch(clips):
+            for clip_path, result in transcode_batch(resolve_bundle, clips, src, archive_root,
+                                                     verified, verify_pool, manifest):
+                if isinstance(result, Future):
+                    pending.append((clip_path, result))
+                elif not result:
+                    print(f"⚠️ Failed to transcode: {clip_path.relative_to(src)}")
+
+        for clips in batches.values():
+            for i in range(0, len(clips), RENDER_BATCH_SIZE):
+                run_batch(clips[i:i + RENDER_BATCH_SIZE])
+
+        fallback = {}
+        for clip_path, fut in direct_futs:
+            result = fut.result()
+            if result is None:
+                fallback.setdefault(format_key(clip_path), []).append(clip_path)
+            elif not result:
+                print(f"⚠️ Failed to transcode: {clip_path.relative_to(src)}")
+        direct_pool.shutdown()
+        for clips in fallback.values():
+            for i in range(0, len(clips), RENDER_BATCH_SIZE):
+                run_batch(clips[i:i + RENDER_BATCH_SIZE])
+
+    for clip_path, fut in pending:
+        if not fut.result():
             print(f"⚠️ Failed to transcode: {clip_path.relative_to(src)}")
+    manifest.save()
 
     print("\n✅ Archive & transcode complete!")
 
@@ -14,13 +14,20 @@ and runs a post-render integrity check using PyAV (or FFmpeg CLI fallback).
 """
 
 import os
+import re
 import sys
+import json
 import shutil
 import argparse
 import subprocess
 import time
 import platform
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
+from typing import Optional
 
 # Optional: PyAV integrity check
 try:
@@ -60,13 +67,99 @@ else:
 PROJECT_NAME = "Batch_H265"
 PRESET_NAME = Path(PRESET_XML_PATH).stem
 
-# Directories (by name) to skip entirely
+# Directories (by name, any case) to skip entirely
 EXCLUDE_DIRS = ["Exports", "Proxies", "Proxy"]
+EXCLUDE_DIRS_SET = frozenset(d.lower() for d in EXCLUDE_DIRS)
 
 # File‑name patterns to skip entirely (case‑insensitive)
 # e.g. "_proxy" will skip foo_proxy.mov or anything with “proxy” in its stem
 EXCLUDE_FILE_PATTERNS = ["_proxy"]
+# ...compiled into one case-insensitive alternation so each name is scanned once
+_EXCLUDE_RE = (re.compile('|'.join(map(re.escape, EXCLUDE_FILE_PATTERNS)), re.IGNORECASE)
+               if EXCLUDE_FILE_PATTERNS else None)
 
+# Timelines built in the current batch, by (stereo template, channels, width, height, fps);
+# later clips of the same shape duplicate one instead of importing the template (see queue_clip)
+_REUSABLE_TL = {}
+
+# av.open() arguments for our own renders: always MP4, so skip format detection and
+# stream probing (the moov atom already describes the streams)
+MP4_OPEN_KW = dict(format='mp4', options={'analyzeduration': '0', 'probesize': '32'})
+
+# Renders already verified, by size and mtime, kept in the archive root (see OkCache);
+# saved after OK_CACHE_FLUSH_EVERY changes or OK_CACHE_FLUSH_SECS, whichever comes first
+OK_CACHE_NAME = ".h265_ok.json"
+OK_CACHE_FLUSH_EVERY = 50
+OK_CACHE_FLUSH_SECS = 30
+
+# Renders verified in the background while the next batch is set up, and the most
+# verifications allowed to wait in the queue before the render loop blocks
+VERIFY_WORKERS = 2
+VERIFY_SLOTS = threading.BoundedSemaphore(4)
+
+# Threads listing directories in gather_files; hides per-directory round-trips on SMB/NFS
+SCAN_WORKERS = 16
+
+# Files at least this big are streamed with a COPY_BUFFER-sized buffer when no clone
+# or kernel copy is available (shutil.copyfile uses 1 MiB reads on Windows)
+LARGE_COPY_MIN = 64 << 20
+COPY_BUFFER = 16 << 20
+
+# Threads used for the asset copy (I/O bound, so more than the core count)
+COPY_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Whether drx_file exists; checked once at startup (see __main__)
+APPLY_DRX = False
+
+# Clips rendered per StartRendering call; clips are batched by format (see transcode_batch)
+RENDER_BATCH_SIZE = 16
+
+# Hide per-file copy/skip lines; failures and totals are still printed (--quiet)
+QUIET = False
+
+
+def is_resolve_running():
+    """
+    Windows only: whether Resolve.exe is running, from one Toolhelp process snapshot
+    (no tasklist subprocess). Returns None on other platforms, or if the snapshot
+    fails, so the caller just tries to connect.
+    """
+    if not IS_WIN:
+        return None
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESSENTRY32W(ctypes.Structure):
+        _fields_ = [('dwSize', wintypes.DWORD), ('cntUsage', wintypes.DWORD),
+                    ('th32ProcessID', wintypes.DWORD), ('th32DefaultHeapID', ctypes.c_size_t),
+                    ('th32ModuleID', wintypes.DWORD), ('cntThreads', wintypes.DWORD),
+                    ('th32ParentProcessID', wintypes.DWORD), ('pcPriClassBase', ctypes.c_long),
+                    ('dwFlags', wintypes.DWORD), ('szExeFile', ctypes.c_wchar * 260)]
+
+    TH32CS_SNAPPROCESS = 0x2
+    kernel32 = ctypes.windll.kernel32
+    # Full prototypes, so the snapshot HANDLE isn't truncated to a 32-bit int on 64-bit
+    kernel32.CreateToolhelp32Snapshot.argtypes = (wintypes.DWORD, wintypes.DWORD)
+    kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+    for fn in (kernel32.Process32FirstW, kernel32.Process32NextW):
+        fn.argtypes = (wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W))
+        fn.restype = wintypes.BOOL
+    kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+    kernel32.CloseHandle.restype = wintypes.BOOL
+    snap = kernel32.CreateToolhelp32Snapshot(TH32CS_SNAPPROCESS, 0)
+    if snap in (None, ctypes.c_void_p(-1).value):  # INVALID_HANDLE_VALUE
+        return None
+    try:
+        entry = PROCESSENTRY32W()
+        entry.dwSize = ctypes.sizeof(entry)
+        ok = kernel32.Process32FirstW(snap, ctypes.byref(entry))
+        while ok:
+            if entry.szExeFile.lower() == 'resolve.exe':
+                return True
+            ok = kernel32.Process32NextW(snap, ctypes.byref(entry))
+        return False
+    finally:
+        kernel32.CloseHandle(snap)
 
 
 def init_resolve():
@@ -87,6 +180,11 @@ def init_resolve():
         return None
 
     # 3) Attempt to connect to the Resolve application via the scripting API
+    #    (fail fast if Resolve isn't running at all, instead of retrying for 30 s)
+    if is_resolve_running() is False:
+        print("❌ DaVinci Resolve doesn’t appear to be running.")
+        print("   Please launch DaVinci Resolve Studio and re‑run this script.")
+        return None
     print("⏳ Connecting to Resolve scripting API...", end="", flush=True)
     resolve = None
     for _ in range(30):
@@ -123,7 +221,7 @@ def init_resolve():
 
     # 5) Switch to the Deliver page and load the render preset
     resolve.OpenPage("deliver")
-    time.sleep(1)
+    wait_until(lambda: resolve.GetCurrentPage() == "deliver", timeout=5)
 
     # Remove any existing preset with the same name
     for preset in project.GetRenderPresetList() or []:
@@ -157,11 +255,14 @@ def select_folder_dialog(prompt: str) -> Path:
         return Path(input(f"{prompt}: ").strip())
 
 
+SIZE_UNITS = ('bytes', 'KB', 'MB', 'GB', 'TB')
+
 def format_size(n_bytes: int) -> str:
-    for unit in ('bytes','KB','MB','GB','TB'):
-        if n_bytes < 1024.0 or unit == 'TB':
-            return f"{n_bytes:,.2f} {unit}"
-        n_bytes /= 1024.0
+    # Each unit is 2**10 of the previous one, so the unit index falls out of bit_length()
+    if n_bytes <= 0:
+        return f"{n_bytes:,.2f} bytes"
+    i = min((int(n_bytes).bit_length() - 1) // 10, len(SIZE_UNITS) - 1)
+    return f"{n_bytes / (1 << (i * 10)):,.2f} {SIZE_UNITS[i]}"
 
 
 def gather_files(src: Path, video_exts, raw_exts):
@@ -169,69 +270,390 @@ def gather_files(src: Path, video_exts, raw_exts):
     Walk src, returning (non_media, media), but skipping:
       • directories in EXCLUDE_DIRS
       • files whose suffix is in raw_exts (skipped entirely)
+      • files whose name matches EXCLUDE_FILE_PATTERNS
     """
-    vset    = {e.lower() for e in video_exts}
-    skipset = {e.lower() for e in raw_exts}
     non_media, media = [], []
+    # One dict lookup per file: lowercase suffix -> list it goes in (None = raw, skipped)
+    ext_target = {e.lower(): media for e in video_exts}
+    ext_target.update({e.lower(): None for e in raw_exts})
+
+    for entry in _walk(src):
+        # Suffix from the name string; Path objects are only built for kept files
+        name = entry.name
+        dot = name.rfind('.')
+        suffix = name[dot:].lower() if dot > 0 else ''
+
+        # 2) skip raw‑image files entirely
+        target = ext_target.get(suffix, non_media)
+        if target is None:
+            continue
 
-    for root, dirs, files in os.walk(src):
-        # 1) prune unwanted directories
-        dirs[:] = [d for d in dirs if d not in EXCLUDE_DIRS]
+        # 3) skip excluded name patterns (e.g. *_proxy.mov)
+        if _EXCLUDE_RE and _EXCLUDE_RE.search(name):
+            continue
 
-        for f in files:
-            p = Path(root) / f
-            suffix = p.suffix.lower()
+        # 4) classify what remains
+        target.append(Path(entry.path))
 
-            # 2) skip raw‑image files entirely
-            if suffix in skipset:
-                continue
+    # The parallel walk returns files in no particular order
+    non_media.sort()
+    media.sort()
+    return non_media, media
 
-            # 3) classify what remains
-            if suffix in vset:
-                media.append(p)
-            else:
-                non_media.append(p)
 
-    return non_media, media
+# Archive folders already created this run (see ensure_dir)
+_MADE_DIRS = set()
+
+
+def ensure_dir(d: Path):
+    """mkdir -p, done once per folder per run."""
+    if d not in _MADE_DIRS:
+        d.mkdir(parents=True, exist_ok=True)
+        _MADE_DIRS.add(d)
+
+
+def _scan_dir(path):
+    """List one directory: (file DirEntry objects, subdirectory paths to descend into)."""
+    files, subdirs = [], []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                # 1) prune unwanted directories (without following dir symlinks, like os.walk);
+                #    pruned here once per folder, so files below them are never listed or tested
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name.lower() not in EXCLUDE_DIRS_SET:
+                        subdirs.append(entry.path)
+                elif entry.is_file():
+                    files.append(entry)
+    except OSError as e:
+        # unreadable folder (locked, "System Volume Information", ...): skip it like os.walk
+        print(f"⚠️ Warning: skipping unreadable folder {path}: {e}")
+        return [], []
+    return files, subdirs
+
+
+def _walk(path):
+    """
+    Yield the file DirEntry objects under path. Directories are listed on SCAN_WORKERS
+    threads, so on network shares many directory listings are in flight at once.
+    """
+    with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as ex:
+        pending = {ex.submit(_scan_dir, path)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                files, subdirs = fut.result()
+                yield from files
+                pending |= {ex.submit(_scan_dir, d) for d in subdirs}
+
+
+def _copyfile2(src: Path, dst: Path) -> bool:
+    """
+    Windows only: CopyFile2, which copies inside the kernel with overlapped I/O and
+    lets SMB shares do a server-side copy. Returns False if the call fails.
+    """
+    import ctypes
+    kernel32 = ctypes.windll.kernel32
+    kernel32.CopyFile2.argtypes = (ctypes.c_wchar_p, ctypes.c_wchar_p, ctypes.c_void_p)
+    return kernel32.CopyFile2(str(src), str(dst), None) == 0  # S_OK
+
+
+def fast_copy(src: Path, dst: Path):
+    """
+    shutil.copy2 replacement. On macOS, try a clonefile(2) copy-on-write clone first,
+    which is instant on APFS when src and dst share a volume. Otherwise (or if cloning
+    fails) use shutil.copyfile, which already copies in the kernel on macOS, then
+    copystat. On Windows, use CopyFile2, and if that fails stream files of
+    LARGE_COPY_MIN or more in COPY_BUFFER chunks into a preallocated file.
+    """
+    if IS_MAC:
+        import ctypes
+        libc = ctypes.CDLL("libc.dylib", use_errno=True)
+        CLONE_NOFOLLOW = 1
+        try:
+            os.unlink(dst)  # clonefile refuses to overwrite
+        except FileNotFoundError:
+            pass
+        if libc.clonefile(os.fsencode(src), os.fsencode(dst), CLONE_NOFOLLOW) == 0:
+            shutil.copystat(src, dst)
+            return
+    elif IS_WIN and _copyfile2(src, dst):
+        shutil.copystat(src, dst)
+        return
+    elif (size := os.stat(src).st_size) >= LARGE_COPY_MIN:
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            # Set the final size first (SetEndOfFile), so NTFS allocates the file in
+            # as few extents as possible instead of growing it chunk by chunk
+            fdst.truncate(size)
+            shutil.copyfileobj(fsrc, fdst, length=COPY_BUFFER)
+            fdst.truncate()  # in case the source shrank while being copied
+        shutil.copystat(src, dst)
+        return
+    shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
+
+
+def _copy_one(job) -> tuple:
+    """
+    Copy one (src, dst, dst_size) asset job unless dst already exists with the same
+    size. dst_size comes from the archive index built in __main__ (None if dst wasn't
+    there), so only the source is stat'ed, and only when dst exists.
+    Returns (status, error) with status 'copied', 'skipped' or 'failed'; printing is
+    left to the caller so output from the worker threads doesn't interleave.
+    """
+    f, outp, dst_size = job
+    try:
+        if dst_size is not None and dst_size == f.stat().st_size:
+            return 'skipped', None
+        fast_copy(f, outp)
+    except OSError as e:
+        return 'failed', e
+    return 'copied', None
 
 
-def is_readable(path: Path) -> bool:
+class OkCache:
+    """
+    {out_rel: [size, mtime_ns, ok]} for renders verified on this or earlier runs.
+    Changes are written in batches (see OK_CACHE_FLUSH_EVERY / _SECS) to a temp file
+    that is fsync'ed and renamed over the old one, so a killed run loses at most the
+    last batch. Thread-safe, since background verifications update it.
+    """
+    def __init__(self, archive_root: Path):
+        self.path = archive_root / OK_CACHE_NAME
+        try:
+            self.entries = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            self.entries = {}
+        self._lock = threading.RLock()
+        self._dirty = 0
+        self._last_flush = time.monotonic()
+
+    def get(self, key):
+        with self._lock:
+            return self.entries.get(key)
+
+    def drop(self, key):
+        with self._lock:
+            if self.entries.pop(key, None) is not None:
+                self._dirty += 1
+
+    def mark(self, key, entry):
+        with self._lock:
+            self.entries[key] = entry
+            self._dirty += 1
+            self.maybe_flush()
+
+    def maybe_flush(self):
+        with self._lock:
+            if self._dirty >= OK_CACHE_FLUSH_EVERY or (
+                    self._dirty and time.monotonic() - self._last_flush >= OK_CACHE_FLUSH_SECS):
+                self.flush()
+
+    def flush(self):
+        """Write pending changes now (temp file, fsync, atomic rename)."""
+        with self._lock:
+            if not self._dirty:
+                return
+            tmp = self.path.with_suffix('.tmp')
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+            self._dirty = 0
+            self._last_flush = time.monotonic()
+
+
+def is_readable(path: Path, deep: bool = False) -> bool:
+    """
+    Check that a rendered MP4 parses. Nothing is decoded: by default the first packets
+    are demuxed; with deep=True the file must also report a duration and demux a
+    packet after seeking to its last second, which catches truncated renders.
+    """
     if not path.exists():
         print(f"⚠️ Integrity failed (not found): {path}")
         return False
     if HAVE_PYAV:
         try:
-            with av.open(str(path)) as ct:
-                for _ in ct.decode(video=0): break
+            with av.open(str(path), **MP4_OPEN_KW) as ct:
+                stream = ct.streams.video[0]
+                if stream.codec_context.codec.name != 'hevc':
+                    print(f"🔍 Unexpected codec in {path.name}: {stream.codec_context.codec.name}")
+                    return False
+                packets = [pkt for _, pkt in zip(range(2), ct.demux(stream))]
+                if not packets or any(pkt.size == 0 for pkt in packets):
+                    print(f"🔍 No usable video packets in {path.name}")
+                    return False
+                if deep:
+                    if not ct.duration or ct.duration <= 0:
+                        print(f"🔍 No duration in {path.name}")
+                        return False
+                    ct.seek(max(0, ct.duration - 1_000_000))  # AV_TIME_BASE units (µs)
+                    if not any(pkt.size for _, pkt in zip(range(4), ct.demux(stream))):
+                        print(f"🔍 No video packets near the end of {path.name}")
+                        return False
             return True
         except Exception as e:
             print(f"🔍 PyAV error on {path.name}: {e}")
             return False
-    p = subprocess.run(['ffmpeg','-v','error','-i',str(path),'-f','null','-'],
-                       stderr=subprocess.PIPE, stdout=subprocess.DEVNULL)
-    return p.returncode == 0
+    # Without PyAV: ffprobe only parses the headers (codec, plus duration when deep)
+    cmd = ['ffprobe','-v','error','-select_streams','v:0',
+           '-show_entries','stream=codec_name' + (':format=duration' if deep else ''),
+           '-of','csv=p=0',str(path)]
+    try:
+        p = subprocess.run(cmd, capture_output=True, text=True, timeout=15)
+    except subprocess.TimeoutExpired:
+        print(f"🔍 Integrity check timed out on {path.name}")
+        return False
+    if p.returncode != 0 or 'hevc' not in p.stdout.lower():
+        return False
+    if deep:
+        try:
+            return float(p.stdout.split()[-1]) > 0
+        except (IndexError, ValueError):
+            return False
+    return True
+
+
+def wait_until(predicate, timeout=10, interval=0.05):
+    """
+    Poll predicate() every `interval` seconds until it returns something truthy,
+    or `timeout` seconds pass. Returns the last value of predicate().
+    Used instead of fixed sleeps while waiting on Resolve to catch up.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        result = predicate()
+        if result or time.monotonic() >= deadline:
+            return result
+        time.sleep(interval)
+
+
+# Render states after which a job will not change any more
+RENDER_DONE = ("Complete", "Failed", "Cancelled")
+
+# A render whose progress hasn't moved for this many seconds is reported as stalled
+RENDER_STALL_SECS = 300
+
+
+def wait_render(project, job_id):
+    """
+    Wait for one render job to finish and return its status dict. Polls with
+    exponential back-off (50 ms up to 2 s), so short jobs are noticed quickly
+    without waking up every few ms during long ones. Progress is printed every 25%,
+    and a warning if it stops moving for RENDER_STALL_SECS.
+    """
+    delay = 0.05
+    last_pct, last_change = 0, time.monotonic()
+    while True:
+        with RESOLVE_LOCK:
+            status = project.GetRenderJobStatus(job_id) or {}
+            if status.get("JobStatus") in RENDER_DONE:
+                return status
+            if not project.IsRenderingInProgress():
+                return project.GetRenderJobStatus(job_id) or {}
+        pct = status.get("CompletionPercentage") or 0
+        now = time.monotonic()
+        if pct != last_pct:
+            if pct // 25 > last_pct // 25 and pct < 100:
+                print(f"⏳ Rendering… {pct}%")
+            last_pct, last_change = pct, now
+        elif now - last_change >= RENDER_STALL_SECS:
+            print(f"⚠️ Render stalled at {pct}% for {RENDER_STALL_SECS // 60} min")
+            last_change = now
+        time.sleep(delay)
+        delay = min(delay * 1.6, 2.0)
+
+
+# Serialises Resolve calls made while a clip is prefetched during a render
+RESOLVE_LOCK = threading.Lock()
+
+
+def import_clips(storage, clip_paths) -> dict:
+    """
+    Import files into the media pool with one call and wait until Resolve has read
+    their metadata. Returns {path: media-pool clip} for the files that imported.
+    """
+    with RESOLVE_LOCK:
+        items = storage.AddItemListToMediaPool([str(p) for p in clip_paths]) or []
+        by_path = {os.path.normcase(it.GetClipProperty().get('File Path') or ''): it for it in items}
+    clips = {p: by_path[os.path.normcase(str(p))] for p in clip_paths
+             if os.path.normcase(str(p)) in by_path}
+    if not clips and len(items) == len(clip_paths):
+        clips = dict(zip(clip_paths, items))  # no file paths reported yet; items come back in order
+
+    pending = list(clips.values())
+    def metadata_read():
+        with RESOLVE_LOCK:
+            while pending and pending[0].GetClipProperty().get('Resolution'):
+                pending.pop(0)
+        return not pending
+    wait_until(metadata_read, timeout=5 + len(pending), interval=0.025)
+    return clips
+
+
+class ClipPrefetcher:
+    """
+    Imports the next batch on a background thread while the current one renders, so
+    its media-pool items and metadata are ready when its turn comes. Only the import
+    is done ahead of time; timelines are still built on the main thread.
+    """
+    def __init__(self):
+        self._pool = ThreadPoolExecutor(max_workers=1)
+        self._paths = None
+        self._future = None
+
+    def start(self, storage, clip_paths):
+        self.wait()
+        self._paths = list(clip_paths)
+        self._future = self._pool.submit(import_clips, storage, self._paths)
+
+    def wait(self):
+        """Block until any in-flight import is done (before touching Resolve again)."""
+        if self._future is not None:
+            self._future.exception()
+
+    def take(self, clip_paths):
+        """Return the prefetched {path: clip} dict if it covers all of `clip_paths`, or None."""
+        if self._future is None:
+            return None
+        future, self._future, self._paths = self._future, None, None
+        try:
+            clips = future.result()
+        except Exception as e:
+            print(f"⚠️ Prefetch failed: {e}")
+            return None
+        return clips if all(p in clips for p in clip_paths) else None
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True)
 
 
 def get_audio_info(clip):
+    """
+    Return (channels, layout, props). Clip properties are fetched once and only
+    re-fetched while Resolve hasn't filled in the channel count yet; the last `props`
+    dict is returned so callers don't need another GetClipProperty() round-trip.
+    """
+    props = clip.GetClipProperty()
     for _ in range(20):
-        props = clip.GetClipProperty()
-        ch = props.get("Audio Channels") or props.get("Audio Ch")
-        if ch not in [None, "", "0"]:
+        raw = props.get("Audio Channels") or props.get("Audio Ch")
+        if raw not in [None, "", "0"]:
             break
         time.sleep(0.25)
-
-    props = clip.GetClipProperty()
-    raw = props.get("Audio Channels") or props.get("Audio Ch")
+        props = clip.GetClipProperty()
+    else:
+        raw = props.get("Audio Channels") or props.get("Audio Ch")
     try:
         channels = int(raw)
     except:
         channels = -1
     layout = (props.get("Audio Track Type") or "").lower()
-    return channels, layout
+    return channels, layout, props
 
-def get_timecode_from_clip(clip):
-    """Return the clip’s start timecode, or None."""
-    props     = clip.GetClipProperty()
+def get_timecode_from_clip(clip, props=None):
+    """Return the clip’s start timecode, or None. Pass `props` to reuse fetched properties."""
+    props     = props or clip.GetClipProperty()
     return props.get("Start TC") or props.get("Start Timecode")
 
 def get_timecode_from_mp4(mp4_path):
@@ -248,26 +670,109 @@ def get_timecode_from_mp4(mp4_path):
         return out or None
     except Exception:
         return None
-# ─── Replace your existing transcode_with_resolve() with this version ──
 
-def transcode_with_resolve(resolve_bundle, clip_path: Path, src_root: Path, archive_root: Path) -> bool:
-    resolve, pm, project = resolve_bundle
-    base = clip_path.stem
-    rel = clip_path.relative_to(src_root) if src_root in clip_path.parents else Path(base)
 
-    out_folder = archive_root / rel.parent
-    out_folder.mkdir(parents=True, exist_ok=True)
-    out_file = out_folder / f"{base}.mp4"
+@dataclass
+class RenderJob:
+    """One clip's output location, and its Resolve render job once queued."""
+    clip_path: Path
+    rel: Path
+    out_file: Path
+    source_tc: Optional[str] = None
+    job_id: Optional[str] = None
+
+
+def format_key(clip_path: Path):
+    """
+    (width, height, frame rate) of a source's first video stream, read with ffprobe.
+    Clips with the same key can share a render batch, since the project frame rate
+    can't change while timelines exist. Clips ffprobe can't read get a key of their own.
+    """
+    cmd = ['ffprobe','-v','error','-select_streams','v:0',
+           '-show_entries','stream=width,height,r_frame_rate','-of','json',str(clip_path)]
+    try:
+        s = json.loads(subprocess.check_output(cmd, text=True))['streams'][0]
+        return (s['width'], s['height'], s['r_frame_rate'])
+    except Exception:
+        return clip_path
+
+
+def clip_format(props):
+    """(width, height, fps string) from a clip's properties, as used for timeline settings."""
+    w, h = map(int, props['Resolution'].split('x'))
+    fps = f"{float(props.get('FPS') or props.get('Frame rate')):.6f}".rstrip('0').rstrip('.')
+    return w, h, fps
+
+
+def remember_ok(ok_cache, archive_root: Path, out_file: Path, ok: bool = True):
+    """Record a verified (or, with ok=False, known-bad) output in `ok_cache` (an OkCache)."""
+    if ok_cache is not None:
+        st = out_file.stat()
+        ok_cache.mark(out_file.relative_to(archive_root).as_posix(), [st.st_size, st.st_mtime_ns, ok])
 
-    # 1) Quick skip if already rendered correctly
-    if out_file.exists() and is_readable(out_file):
-        print(f"✅ Skipping (exists & OK): {rel}")
+
+def precheck_outputs(media, src_root: Path, archive_root: Path, ok_cache):
+    """
+    Run the deep is_readable() check (the one verify_render uses) over every render
+    already in the archive that `ok_cache` has no current entry for, in parallel, and
+    record each result in the cache, so the render loop finds good renders there and
+    deletes bad ones without checking them one at a time.
+    """
+    targets = []
+    for clip_path in media:
+        rel = clip_path.relative_to(src_root) if src_root in clip_path.parents else Path(clip_path.stem)
+        out_file = archive_root / rel.parent / f"{clip_path.stem}.mp4"
+        try:
+            st = out_file.stat()
+        except FileNotFoundError:
+            continue
+        cached = ok_cache.get(out_file.relative_to(archive_root).as_posix())
+        if st.st_size and not (cached and cached[:2] == [st.st_size, st.st_mtime_ns]):
+            targets.append(out_file)
+    if not targets:
+        return
+
+    print(f"🔍 Checking {len(targets)} existing render(s)...")
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as ex:
+        for out_file, ok in zip(targets, ex.map(partial(is_readable, deep=True), targets)):
+            remember_ok(ok_cache, archive_root, out_file, ok)
+    ok_cache.flush()
+
+
+def check_existing_output(job: RenderJob, archive_root: Path, ok_cache=None):
+    """
+    Returns True if a good render of the clip already exists, False if a corrupt one
+    could not be removed, or None if the clip needs rendering.
+    """
+    out_file, rel = job.out_file, job.rel
+    out_key = out_file.relative_to(archive_root).as_posix()
+
+    # 1) Quick skip if already rendered correctly (cached from an earlier run, or checked now)
+    try:
+        st = out_file.stat()
+    except FileNotFoundError:
+        st = None
+    cached = ok_cache.get(out_key) if ok_cache is not None else None
+    fresh = bool(st and cached and cached[:2] == [st.st_size, st.st_mtime_ns])
+    if fresh and cached[2]:
+        if not QUIET:
+            print(f"✅ Skipping (cached OK): {rel}")
+        return True
+    if cached and not fresh:
+        ok_cache.drop(out_key)  # file changed or vanished since it was checked
+    if st and st.st_size == 0:
+        print(f"⚠️ Empty output, re-rendering: {rel}")  # definitely broken; no need to open it
+    elif fresh:
+        print(f"⚠️ Output failed verification earlier, re-rendering: {rel}")
+    elif st and is_readable(out_file, deep=True):
+        if not QUIET:
+            print(f"✅ Skipping (exists & OK): {rel}")
+        remember_ok(ok_cache, archive_root, out_file)
         return True
 
     # 2) If corrupt MP4 exists, delete it (with retries on Windows locks)
-    if out_file.exists():
+    if st:
         print(f"⚠️ Corrupt output, deleting old file: {out_file}")
-        time.sleep(1)
         for attempt in range(3):
             try:
                 out_file.unlink()
@@ -278,140 +783,257 @@ def transcode_with_resolve(resolve_bundle, clip_path: Path, src_root: Path, arch
         else:
             print(f"❌ Could not delete old file after retries: {out_file}")
             return False
+        if fresh:
+            ok_cache.drop(out_key)
+    return None
+
 
-    # 3) Clean Resolve project
+def queue_clip(resolve_bundle, job: RenderJob, clip, index: int) -> bool:
+    """
+    Build a timeline for one imported clip and add its render job, without starting
+    the render. Sets job.source_tc and job.job_id; returns False on failure.
+    """
+    resolve, pm, project = resolve_bundle
     mp = project.GetMediaPool()
-    storage = resolve.GetMediaStorage()
-    project.DeleteAllRenderJobs()
-    for i in range(1, project.GetTimelineCount() + 1):
-        tl = project.GetTimelineByIndex(i)
-        if tl:
-            mp.DeleteTimelines([tl])
-    clips = mp.GetRootFolder().GetClipList() or []
-    if clips:
-        mp.DeleteClips(clips)
-    print("🧹 Resolve cleaned.")
+    base = job.clip_path.stem
 
-    # 4) Import source clip
-    print(f"📥 Importing: {clip_path}")
-    items = storage.AddItemListToMediaPool([str(clip_path)])
-    time.sleep(2)
-    if not items:
-        print(f"❌ Import failed: {clip_path}")
-        return False
-    clip = items[0]
+    # 5) Read clip properties once (retried until the audio channels are known)
+    channels, layout, props = get_audio_info(clip)
 
-    # 5) Grab source timecode (if any)
-    raw_source_tc = get_timecode_from_clip(clip)
+    # 6) Grab source timecode (if any), resolution & FPS from the same properties
+    raw_source_tc = get_timecode_from_clip(clip, props)
     if raw_source_tc:
         # normalize drop-frame semicolon to plain colon
-        source_tc = raw_source_tc.replace(';', ':')
-        print(f"🔎 Source Start TC: {raw_source_tc}  →  normalized to {source_tc}")
+        job.source_tc = raw_source_tc.replace(';', ':')
+        print(f"🔎 Source Start TC: {raw_source_tc}  →  normalized to {job.source_tc}")
     else:
-        source_tc = None
         print("⚠️ No Start TC found on source clip; defaulting to 00:00:00:00")
 
-    # 6) Read clip properties for resolution & FPS
-    props = clip.GetClipProperty()
-    w, h = map(int, props['Resolution'].split('x'))
-    fps = f"{float(props.get('FPS') or props.get('Frame rate')):.6f}".rstrip('0').rstrip('.')
-
-    project.SetSetting("timelineUseCustomSettings", "1")
-    project.SetSetting("timelineResolutionWidth", str(w))
-    project.SetSetting("timelineResolutionHeight", str(h))
-    project.SetSetting("timelineFrameRate", fps)
-    project.SetSetting("timelinePlaybackFrameRate", fps)
+    w, h, fps = clip_format(props)
 
     # 7) Pick mono vs stereo template
-    channels, layout = get_audio_info(clip)
     use_stereo = (channels == 2 and (layout == "" or "stereo" in layout))
     drt_path = DRT_TEMPLATE_STEREO if use_stereo else DRT_TEMPLATE_MONO
     print(f"🎧 Detected {channels}ch; using {'stereo' if use_stereo else 'mono'} template")
 
-    # 8) Import template timeline
-    tl_name = f"TL_{base}"
-    timeline = mp.ImportTimelineFromFile(drt_path, {
-        "timelineName": tl_name,
-        "importSourceClips": False
-    })
-    if not timeline:
-        print(f"❌ Failed to import template: {drt_path}")
-        return False
+    # 8) One timeline per clip, so each render job keeps its own clip and start timecode.
+    #    A clip shaped like an earlier one in the batch (same audio layout, resolution and
+    #    frame rate) duplicates that timeline (settings and pruned tracks included) and
+    #    swaps its items; otherwise the template is imported.
+    tl_name = f"TL_{index:03d}_{base}"
+    tl_key = (use_stereo, channels, w, h, fps)
+    source_tl = _REUSABLE_TL.get(tl_key)
+    duplicate = getattr(source_tl, 'DuplicateTimeline', None)
+    timeline = duplicate(tl_name) if callable(duplicate) else None
+    reused = bool(timeline)
+    if reused:
+        items = [it for tt in ('video', 'audio')
+                 for i in range(1, timeline.GetTrackCount(tt) + 1)
+                 for it in (timeline.GetItemListInTrack(tt, i) or [])]
+        if items:
+            timeline.DeleteClips(items)
+        print("♻️ Reusing timeline layout from an earlier clip.")
+    else:
+        timeline = mp.ImportTimelineFromFile(drt_path, {
+            "timelineName": tl_name,
+            "importSourceClips": False
+        })
+        if not timeline:
+            print(f"❌ Failed to import template: {drt_path}")
+            return False
+    project.SetCurrentTimeline(timeline)
 
-    # 9) Apply source timecode to the new timeline
-    if source_tc:
-        ok = timeline.SetStartTimecode(source_tc)
+    # 9) Apply source timecode to the timeline (a duplicated timeline still carries the
+    #    start TC of the clip it was copied from, so it is always reset)
+    if job.source_tc or reused:
+        ok = timeline.SetStartTimecode(job.source_tc or "00:00:00:00")
         print(f"✅ SetStartTimecode returned: {ok}")
 
-    # 10) Double‑check timeline settings
-    timeline.SetSetting("timelineResolutionWidth", str(w))
-    timeline.SetSetting("timelineResolutionHeight", str(h))
-    timeline.SetSetting("timelineFrameRate", fps)
-    timeline.SetSetting("timelinePlaybackFrameRate", fps)
-    tw = timeline.GetSetting("timelineResolutionWidth")
-    th = timeline.GetSetting("timelineResolutionHeight")
-    tfps = timeline.GetSetting("timelineFrameRate")
-    print(f"📐 Timeline set to: {tw}x{th} @ {tfps} fps")
-
-    # 11) Append clip and prune empty tracks
+    # 10) Double‑check timeline settings (each call is a round-trip into Resolve, so the
+    #     values aren't read back just to be printed; a duplicated timeline has them already)
+    if not reused:
+        ok = all([timeline.SetSetting("timelineResolutionWidth", str(w)),
+                  timeline.SetSetting("timelineResolutionHeight", str(h)),
+                  timeline.SetSetting("timelineFrameRate", fps),
+                  timeline.SetSetting("timelinePlaybackFrameRate", fps)])
+        print(f"📐 Timeline set to: {w}x{h} @ {fps} fps" + ("" if ok else " (some settings were refused)"))
+
+    # 11) Append clip and prune empty tracks (already pruned on a duplicated timeline)
     if not mp.AppendToTimeline([clip]):
         print("❌ Failed to append actual media to timeline.")
         return False
 
-    used_tracks = {'video': set(), 'audio': set()}
-    for track_type in ['video', 'audio']:
-        for i in range(1, timeline.GetTrackCount(track_type) + 1):
-            if timeline.GetItemListInTrack(track_type, i):
-                used_tracks[track_type].add(i)
-    for track_type in ['video', 'audio']:
-        for i in reversed(range(1, timeline.GetTrackCount(track_type) + 1)):
-            if i not in used_tracks[track_type]:
+    if not reused:
+        for track_type in ['video', 'audio']:
+            count = timeline.GetTrackCount(track_type)
+            empty = [i for i in range(1, count + 1) if not timeline.GetItemListInTrack(track_type, i)]
+            for i in reversed(empty):
                 timeline.DeleteTrack(track_type, i)
+        _REUSABLE_TL[tl_key] = timeline
 
-    # 12) Load render preset (assumes you’ve already imported it) and set output
-    project.LoadRenderPreset(PRESET_NAME)
+    # 12) Set this job's output (the preset is loaded once per batch)
     project.SetRenderSettings({
-        'TargetDir': str(out_folder),
+        'TargetDir': str(job.out_file.parent),
         'CustomName': base,
     })
 
-    # 13) Optional DRX grade
-    if os.path.exists(drx_file):
-        resolve.OpenPage("color")
-        time.sleep(1)
-        for vc in project.GetCurrentTimeline().GetItemListInTrack('video', 1) or []:
+    # 13) Optional DRX grade (stays on the color page between clips)
+    if APPLY_DRX:
+        if resolve.GetCurrentPage() != "color":
+            resolve.OpenPage("color")
+            wait_until(lambda: resolve.GetCurrentPage() == "color", timeout=5)
+        for vc in timeline.GetItemListInTrack('video', 1) or []:
             fn = getattr(vc.GetNodeGraph(), 'ApplyGradeFromDRX', None)
             if callable(fn) and fn(str(drx_file), 0):
                 print(f"✅ Applied grade to {vc.GetName()}")
 
-    # 14) Render
-    job_id = project.AddRenderJob()
-    if not job_id:
+    # 14) Queue the render job for this clip's timeline
+    job.job_id = project.AddRenderJob()
+    if not job.job_id:
         print(f"❌ Failed to queue render for {base}")
         return False
-    print(f"🚀 Rendering: {rel}")
-    project.StartRendering()
-    while project.IsRenderingInProgress():
-        time.sleep(1)
-    print(f"🏁 Completed render: {rel}")
+    return True
+
 
-    # 15) Verify integrity and timecode in the MP4
-    if is_readable(out_file):
-        print(f"✅ Integrity OK: {rel}")
-        mp4_tc = get_timecode_from_mp4(out_file)
+def verify_render(job: RenderJob, archive_root: Path, ok_cache=None) -> bool:
+    """Check a finished render's integrity and timecode, and remember it if good."""
+    # 16) Verify integrity and timecode in the MP4
+    if is_readable(job.out_file, deep=True):
+        print(f"✅ Integrity OK: {job.rel}")
+        mp4_tc = get_timecode_from_mp4(job.out_file)
         if mp4_tc:
             print(f"▶️ Rendered MP4 timecode: {mp4_tc}")
-            if source_tc and mp4_tc == source_tc:
+            if job.source_tc and mp4_tc == job.source_tc:
                 print("🎉 SUCCESS: MP4 timecode matches source!")
             else:
                 print("❌ WARNING: MP4 timecode does not match source.")
         else:
             print("⚠️ No timecode tag found in MP4 (or ffprobe missing).")
+        remember_ok(ok_cache, archive_root, job.out_file)
         return True
 
-    print(f"⚠️ Integrity still failed: {rel}")
+    print(f"⚠️ Integrity still failed: {job.rel}")
+    # Don't leave the bad render behind for a header-only check to accept later
+    try:
+        job.out_file.unlink(missing_ok=True)
+    except OSError as e:
+        print(f"⚠️ Could not delete failed render {job.rel}: {e}")
+        remember_ok(ok_cache, archive_root, job.out_file, ok=False)
     return False
 
+
+def transcode_batch(resolve_bundle, clip_paths, src_root: Path, archive_root: Path,
+                    ok_cache=None, prefetcher=None, next_batch=None, verify_pool=None) -> list:
+    """
+    Render a batch of clips that share a format (see format_key): clean the project
+    and set its frame rate once, give each clip its own timeline and render job, and
+    start all the jobs with a single StartRendering call. Returns [(clip_path, ok)];
+    with a `verify_pool`, ok is a Future for verify_render() for each finished render.
+
+    `ok_cache` is an OkCache; outputs whose size and mtime match it are skipped
+    without opening them, and newly verified outputs are added to it. With a
+    ClipPrefetcher, `next_batch` is imported in the background while this batch renders.
+    """
+    resolve, pm, project = resolve_bundle
+
+    results, pending = [], []
+    for clip_path in clip_paths:
+        rel = clip_path.relative_to(src_root) if src_root in clip_path.parents else Path(clip_path.stem)
+        out_folder = archive_root / rel.parent
+        ensure_dir(out_folder)
+        job = RenderJob(clip_path, rel, out_folder / f"{clip_path.stem}.mp4")
+        ok = check_existing_output(job, archive_root, ok_cache)
+        if ok is None:
+            pending.append(job)
+        else:
+            results.append((clip_path, ok))
+    if not pending:
+        return results
+    paths = [job.clip_path for job in pending]
+
+    # 3) Clear old render jobs, timelines and clips once for the whole batch,
+    #    keeping any clips imported in the background during the previous render
+    if prefetcher:
+        prefetcher.wait()
+    mp = project.GetMediaPool()
+    storage = resolve.GetMediaStorage()
+    clips = prefetcher.take(paths) if prefetcher else None
+    # compared by media id: Resolve's wrapper objects aren't guaranteed to be hashable or
+    # to compare equal to the ones a fresh GetClipList() returns
+    keep = {c.GetMediaId() for c in (clips or {}).values()}
+    project.DeleteAllRenderJobs()
+    timelines = [project.GetTimelineByIndex(i) for i in range(1, project.GetTimelineCount() + 1)]
+    if any(timelines):
+        mp.DeleteTimelines([tl for tl in timelines if tl])
+    old_clips = [c for c in (mp.GetRootFolder().GetClipList() or []) if c.GetMediaId() not in keep]
+    if old_clips:
+        mp.DeleteClips(old_clips)
+    _REUSABLE_TL.clear()
+    print("🧹 Resolve cleaned.")
+
+    # 4) Import the batch's source clips in one call (or pick up the prefetched ones)
+    if clips:
+        print(f"📥 Using prefetched import of {len(clips)} clip(s)")
+    else:
+        print(f"📥 Importing {len(paths)} clip(s)")
+        clips = import_clips(storage, paths)
+
+    # Project frame rate can only be set while no timelines exist, so set it once here
+    first = next((clips[p] for p in paths if p in clips), None)
+    if first:
+        w, h, fps = clip_format(first.GetClipProperty())
+        project.SetSetting("timelineUseCustomSettings", "1")
+        project.SetSetting("timelineResolutionWidth", str(w))
+        project.SetSetting("timelineResolutionHeight", str(h))
+        project.SetSetting("timelineFrameRate", fps)
+        project.SetSetting("timelinePlaybackFrameRate", fps)
+
+    # Load the render preset (imported in init_resolve) once; each job only changes its
+    # output name and folder. Render each timeline as a single clip.
+    project.LoadRenderPreset(PRESET_NAME)
+    project.SetCurrentRenderMode(1)
+
+    queued = []
+    for n, job in enumerate(pending):
+        clip = clips.get(job.clip_path)
+        if not clip:
+            print(f"❌ Import failed: {job.clip_path}")
+            results.append((job.clip_path, False))
+        elif queue_clip(resolve_bundle, job, clip, n):
+            queued.append(job)
+        else:
+            results.append((job.clip_path, False))
+    if not queued:
+        return results
+
+    # Graded clips were queued from the Color page; return to Deliver once per batch
+    if APPLY_DRX and resolve.GetCurrentPage() != "deliver":
+        resolve.OpenPage("deliver")
+        wait_until(lambda: resolve.GetCurrentPage() == "deliver", timeout=5)
+
+    # 15) Render every queued job in one go
+    print(f"🚀 Rendering {len(queued)} job(s)...")
+    project.StartRendering([job.job_id for job in queued])
+    if prefetcher and next_batch:
+        prefetcher.start(storage, next_batch)
+
+    # Jobs render in queue order, so wait on each in turn and verify it right away
+    for job in queued:
+        status = wait_render(project, job.job_id).get('JobStatus')
+        print(f"🏁 Render job for {job.rel} finished with status: {status}")
+        if status != 'Complete':
+            print(f"❌ Render did not complete successfully for {job.rel}")
+            results.append((job.clip_path, False))
+        elif verify_pool is not None:
+            VERIFY_SLOTS.acquire()
+            fut = verify_pool.submit(verify_render, job, archive_root, ok_cache)
+            fut.add_done_callback(lambda _: VERIFY_SLOTS.release())
+            results.append((job.clip_path, fut))
+        else:
+            results.append((job.clip_path, verify_render(job, archive_root, ok_cache)))
+    return results
+
+
 # __main__ block with folder-based skip logic
 
 if __name__ == '__main__':
@@ -424,7 +1046,13 @@ if __name__ == '__main__':
     parser.add_argument('-r', '--raw-exts', nargs='*',
                         default=['.arw', '.cr2', '.cr3', '.nef', '.dng', '.raf', '.orf', '.rw2', '.sr2'],
                         help="Raw file extensions to ignore during asset copy")
+    parser.add_argument('--batch-size', type=int, default=RENDER_BATCH_SIZE,
+                        help="Max clips of the same format rendered per StartRendering call")
+    parser.add_argument('--quiet', action='store_true',
+                        help="Only print failures and totals for copied/skipped files")
     args = parser.parse_args()
+    RENDER_BATCH_SIZE = max(1, args.batch_size)
+    QUIET = args.quiet
 
     # 1. Determine source and destination
     src = Path(args.source) if args.source else select_folder_dialog("Select project root")
@@ -434,44 +1062,98 @@ if __name__ == '__main__':
     # 2. Gather all files
     non_media_all, media_all = gather_files(src, args.video_exts, args.raw_exts)
 
-    # 3. Build map: folder -> set of media stems in that folder
-    media_stems_by_dir = {}
-    for m in media_all:
-        media_stems_by_dir.setdefault(m.parent, set()).add(m.stem.lower())
+    # 3. Build set of (folder, lowercase stem) for every media file
+    media_keys = frozenset((m.parent, m.stem.lower()) for m in media_all)
 
     # 4. Prepare archive folder
     archive_root = dst / f"{src.name}-265"
     archive_root.mkdir(parents=True, exist_ok=True)
 
     # 5. Copy non-media assets, skipping any file that shares stem with a media file in same folder
+    #    Sizes of what's already in the archive, from one scandir pass over it
+    dst_sizes = {entry.path: entry.stat().st_size for entry in _walk(archive_root)}
+    copy_jobs = []
     for f in non_media_all:
         rel = f.relative_to(src)
-        stem = f.stem.lower()
 
         # Skip side‑cars that have same name as media in the same directory
-        if stem in media_stems_by_dir.get(f.parent, set()):
-            print(f"🔕 Skipping side‑car asset: {rel}")
+        if (f.parent, f.stem.lower()) in media_keys:
+            if not QUIET:
+                print(f"🔕 Skipping side‑car asset: {rel}")
             continue
 
-        # Copy if not already present with correct size
         outp = archive_root / rel
-        outp.parent.mkdir(parents=True, exist_ok=True)
-        if outp.exists() and outp.stat().st_size == f.stat().st_size:
-            print(f"⏭️ Skipping existing: {rel}")
-            continue
+        copy_jobs.append((f, outp, dst_sizes.get(str(outp))))
+
+    # Create each destination folder once, before the workers start
+    for _, outp, _ in copy_jobs:
+        ensure_dir(outp.parent)
+
+    # Copy (if not already present with correct size) on a thread pool
+    counts = {'copied': 0, 'skipped': 0, 'failed': 0}
+    with ThreadPoolExecutor(max_workers=COPY_WORKERS) as ex:
+        futures = {ex.submit(_copy_one, job): job[0] for job in copy_jobs}
+        for fut in as_completed(futures):
+            rel = futures[fut].relative_to(src)
+            status, err = fut.result()
+            counts[status] += 1
+            if status == 'copied':
+                if not QUIET:
+                    print(f"📋 Copied asset: {rel}")
+            elif status == 'skipped':
+                if not QUIET:
+                    print(f"⏭️ Skipping existing: {rel}")
+            else:
+                print(f"❌ Failed to copy asset {rel}: {err}")
+    print(f"📋 Assets: {counts['copied']} copied, {counts['skipped']} already present, "
+          f"{counts['failed']} failed")
 
-        shutil.copy2(f, outp)
-        print(f"📋 Copied asset: {rel}")
+    # Outputs verified on earlier runs
+    ok_cache = OkCache(archive_root)
+
+    # Check renders left by earlier runs all at once, before Resolve is involved
+    precheck_outputs(media_all, src, archive_root, ok_cache)
 
     # 6. Initialize Resolve
     resolve_bundle = init_resolve()
     if not resolve_bundle:
         sys.exit(1)
 
-    # 7. Transcode each media file
-    for clip_path in media_all:
-        # Skip proxies and raw files if desired (media_all already excludes proxies by design)
-        if not transcode_with_resolve(resolve_bundle, clip_path, src, archive_root):
-            print(f"⚠️ Failed to transcode: {clip_path.relative_to(src)}")
+    # 7. Transcode media in batches of clips sharing resolution and frame rate, one
+    #    StartRendering per batch. The next batch is imported while the current one renders.
+    APPLY_DRX = os.path.exists(drx_file)
+    with ThreadPoolExecutor(max_workers=COPY_WORKERS) as ex:
+        clip_keys = dict(zip(media_all, ex.map(format_key, media_all)))
+
+    def make_batches(clip_paths):
+        by_format = {}
+        for clip_path in clip_paths:
+            by_format.setdefault(clip_keys[clip_path], []).append(clip_path)
+        return [clips[i:i + RENDER_BATCH_SIZE] for clips in by_format.values()
+                for i in range(0, len(clips), RENDER_BATCH_SIZE)]
+
+    #    Renders are verified on a background pool so the next batch starts right away;
+    #    clips that fail (render or verification) get one more try at the end.
+    prefetcher = ClipPrefetcher()
+    try:
+        with ThreadPoolExecutor(max_workers=VERIFY_WORKERS) as verify_pool:
+            todo = media_all
+            for attempt in range(2):
+                if attempt and todo:
+                    print(f"🔁 Retrying {len(todo)} failed clip(s)…")
+                batches = make_batches(todo)
+                results = []
+                for i, batch in enumerate(batches):
+                    # Skip proxies and raw files if desired (media_all already excludes proxies by design)
+                    next_batch = batches[i + 1] if i + 1 < len(batches) else None
+                    results += transcode_batch(resolve_bundle, batch, src, archive_root, ok_cache,
+                                               prefetcher, next_batch, verify_pool)
+                todo = [clip_path for clip_path, ok in results
+                        if not (ok.result() if isinstance(ok, Future) else ok)]
+            for clip_path in todo:
+                print(f"⚠️ Failed to transcode: {clip_path.relative_to(src)}")
+    finally:
+        prefetcher.shutdown()
+        ok_cache.flush()
 
     print("\n✅ Archive & transcode complete!")